@@ -1,50 +1,146 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, Body, Form
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, Response, ORJSONResponse
 from fastapi.templating import Jinja2Templates
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+import asyncio
+import atexit
+import threading
 import time
 import uuid
 import os
+import hashlib
+import functools
+import gzip
+import heapq
+import hmac
+import jinja2
+import operator
+import orjson
+from datetime import datetime as _dt
 from app.models.route import Route, RouteCreate, RouteUpdate
 from app.models.request import Request as RequestModel, RequestFilter
-from app.api.mock import add_route, remove_route, update_route, get_all_routes, get_request_history, get_request_history_count, get_response_history
+from app.api.mock import add_route, remove_route, update_route, bulk_save_routes, get_all_routes, get_route_by_id, get_request_history, get_request_history_count, get_response_history, get_routes_version, get_route_search_text, get_routes_by_group, get_routes_by_tag, get_request_history_version, get_recent_requests, reload_recent_requests, clear_history, flush_history_writes_async, request_by_id, response_by_request_id
 from app.core.security import authenticate_user, create_access_token
 from app.core.config import config
+from app.storage.database import db_storage
+from app.services.config_manager import config_manager
+from app.services.data_manager import data_manager
+from app.services.analytics import analytics_manager
 
-# 创建路由处理实例
-router = APIRouter(tags=["admin"])
+# 创建路由处理实例（默认使用orjson序列化JSON响应）
+router = APIRouter(tags=["admin"], default_response_class=ORJSONResponse)
 
-# 根路径处理
-@router.get("/admin", response_class=HTMLResponse)
-async def admin_root(request: Request):
-    """管理界面根路径"""
-    # 获取最近24小时的请求历史，限制为100条
-    start_time = time.time() - (24 * 3600)
-    end_time = time.time()
-    requests = get_request_history(limit=100, start_time=start_time, end_time=end_time)
-    
-    return templates.TemplateResponse(
-        "admin.html",
-        {
-            "request": request,
-            "routes": get_all_routes(),
-            "requests": requests[:50],
-            "config": config
-        }
-    )
-
-# 模板引擎
+# 模板引擎（模块级单例，编译结果通过字节码缓存跨进程复用）
 templates = Jinja2Templates(directory="app/templates")
+# 使用Jinja默认的按用户隔离的缓存目录（会校验目录属主和0700权限，防止其他用户植入缓存文件）
+templates.env.bytecode_cache = jinja2.FileSystemBytecodeCache()
+# 非调试模式下关闭自动重载，避免每次渲染都stat模板文件
+templates.env.auto_reload = config.server.debug
+
+# 时间显示格式
+_FMT = "%Y-%m-%d %H:%M:%S"
 
 # 添加自定义过滤器
 def timestamp_filter(value):
     """将时间戳转换为可读时间"""
-    import datetime
-    return datetime.datetime.fromtimestamp(value).strftime('%Y-%m-%d %H:%M:%S')
+    return _dt.fromtimestamp(value).strftime(_FMT)
 
 # 注册过滤器
 templates.env.filters['timestamp'] = timestamp_filter
 
+# 启动时预先编译管理界面模板（调试模式下每次渲染重新获取，以便模板修改自动重载）
+_admin_tmpl = templates.get_template("admin.html")
+
+# 一天的秒数
+_DAY_SECONDS = 86400
+
+# 仪表盘渲染缓存的时间粒度（秒），保证24小时窗口外的请求能按时移出页面
+DASHBOARD_CACHE_BUCKET = 60
+
+
+# 仪表盘渲染结果缓存的状态数
+DASHBOARD_CACHE_SIZE = 4
+
+
+def _render_dashboard_html(routes, requests):
+    """渲染管理界面HTML（在线程池中执行，只使用事件循环中取好的快照）"""
+    template = templates.get_template("admin.html") if config.server.debug else _admin_tmpl
+    return template.render({
+        "routes": routes,
+        "requests": requests,
+        "config": config
+    })
+
+
+# 仪表盘渲染结果缓存（状态 -> HTML，按插入顺序淘汰最早的状态）
+_dashboard_cache: Dict[tuple, str] = {}
+
+# 进行中的仪表盘渲染任务，相同状态的并发请求共享同一次渲染
+_pending_renders: Dict[tuple, asyncio.Future] = {}
+
+
+def _finish_dashboard_render(state, future):
+    """仪表盘渲染完成后移出进行中的任务，并缓存成功的渲染结果"""
+    _pending_renders.pop(state, None)
+    if future.cancelled() or future.exception() is not None:
+        return
+    _dashboard_cache[state] = future.result()
+    while len(_dashboard_cache) > DASHBOARD_CACHE_SIZE:
+        del _dashboard_cache[next(iter(_dashboard_cache))]
+
+
+async def _get_dashboard_html(state):
+    """获取管理界面HTML（按状态缓存），合并并发的相同渲染"""
+    html = _dashboard_cache.get(state)
+    if html is not None:
+        return html
+    pending = _pending_renders.get(state)
+    if pending is None:
+        # 路由和最近请求在事件循环中取快照（最近请求记录在事件循环中追加，不能在线程中遍历）
+        # 最近24小时以时间桶起点为基准，同一状态的渲染结果一致
+        time_bucket = state[-1]
+        requests = get_recent_requests(start_time=time_bucket * DASHBOARD_CACHE_BUCKET - _DAY_SECONDS)
+        routes = get_all_routes()
+        # 只把模板渲染放到线程池中，渲染期间到达的相同请求直接等待该结果
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(None, _render_dashboard_html, routes, requests)
+        _pending_renders[state] = pending
+        pending.add_done_callback(functools.partial(_finish_dashboard_render, state))
+    return await pending
+
+
+async def _dashboard_response(request: Request):
+    """返回管理界面，状态未变化时返回304"""
+    # 页面中展示的配置项也参与缓存键，配置修改后能立即生效
+    config_key = (
+        config.server.port,
+        config.server.enable_https,
+        config.proxy.enable,
+        config.proxy.target_url,
+    )
+    state = (
+        get_routes_version(),
+        get_request_history_version(),
+        config_key,
+        int(time.time() // DASHBOARD_CACHE_BUCKET),
+    )
+    etag = '"%s"' % hashlib.blake2b(repr(state).encode(), digest_size=8).hexdigest()
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    return HTMLResponse(await _get_dashboard_html(state), headers={"ETag": etag})
+
+
+# 管理界面（根路径、仪表盘和UI入口共用同一处理函数）
+@router.get("/admin", response_class=HTMLResponse)
+@router.get("/admin/", response_class=HTMLResponse)
+@router.get("/admin/ui", response_class=HTMLResponse)
+async def admin_dashboard(request: Request):
+    """管理界面"""
+    return await _dashboard_response(request)
+
 
 # 全局分组集合，用于存储所有创建的分组
 created_groups = set()
@@ -55,7 +151,6 @@ created_tags = set()
 # 从数据库加载分组和标签
 def load_groups_and_tags():
     """从数据库加载分组和标签"""
-    from app.storage.database import db_storage
     global created_groups, created_tags
     
     # 加载分组
@@ -67,22 +162,134 @@ def load_groups_and_tags():
     tags_data = db_storage.get_config('created_tags')
     if tags_data:
         created_tags = set(tags_data)
+    
+    # 补充现有路由中已使用的分组和标签，之后只需检查全局集合即可判断是否已存在
+    for route in get_all_routes():
+        if route.group:
+            created_groups.add(route.group)
+        if route.tags:
+            created_tags.update(route.tags)
 
 # 保存分组和标签到数据库
 def save_groups_and_tags():
     """保存分组和标签到数据库"""
-    from app.storage.database import db_storage
-    global created_groups, created_tags
+    # 先同时获取两个集合的不可变快照（可能在延迟保存线程中执行，写数据库期间集合可能被修改）
+    groups_snapshot = frozenset(created_groups)
+    tags_snapshot = frozenset(created_tags)
     
     # 保存分组
-    db_storage.save_config('created_groups', list(created_groups))
+    db_storage.save_config('created_groups', list(groups_snapshot))
     
     # 保存标签
-    db_storage.save_config('created_tags', list(created_tags))
+    db_storage.save_config('created_tags', list(tags_snapshot))
+    
+    # 分组和标签集合修改后都会保存，在此统一使统计缓存失效
+    invalidate_stats()
+
+
+# 分组和标签使用次数统计缓存（路由快照或已创建集合变化时重新计算）
+_stats_cache = {"routes": None, "created_version": -1, "groups": {}, "tags": {}, "groups_lower": {}, "tags_lower": {}}
+_created_version = 0
+
+
+def invalidate_stats():
+    """已创建的分组或标签集合变化后，使统计缓存失效"""
+    global _created_version
+    _created_version += 1
+
+
+def _compute_stats():
+    """统计分组和标签的使用次数，路由和已创建集合未变化时直接返回缓存"""
+    routes = get_all_routes()
+    if _stats_cache["routes"] is routes and _stats_cache["created_version"] == _created_version:
+        return _stats_cache
+    
+    # Counter 在C层完成计数，每次累加只需一次字典查找
+    group_stats = Counter(route.group for route in routes if route.group)
+    tag_stats = Counter(tag for route in routes if route.tags for tag in route.tags)
+    
+    # 添加所有已创建但还没有关联路由的分组和标签
+    for group_name in created_groups:
+        group_stats.setdefault(group_name, 0)
+    for tag_name in created_tags:
+        tag_stats.setdefault(tag_name, 0)
+    
+    # 预先计算小写名称，模糊搜索时无需每次请求重复转换
+    _stats_cache.update(
+        routes=routes,
+        created_version=_created_version,
+        groups=group_stats,
+        tags=tag_stats,
+        groups_lower={name: name.lower() for name in group_stats},
+        tags_lower={name: name.lower() for name in tag_stats},
+    )
+    return _stats_cache
+
+
+# 按使用次数排序的键
+_count_key = operator.itemgetter("count")
+
+
+def _get_group_stats():
+    """获取分组使用次数 {分组名: 路由数}（只读）"""
+    return _compute_stats()["groups"]
+
+
+def _get_tag_stats():
+    """获取标签使用次数 {标签名: 路由数}（只读）"""
+    return _compute_stats()["tags"]
+
+
+# 分组和标签的延迟保存：合并短时间内的多次修改为一次写入，避免阻塞请求
+GROUPS_TAGS_SAVE_DELAY = 0.5
+_groups_tags_save_timer = None
+_groups_tags_save_lock = threading.Lock()
+
+
+def _flush_groups_and_tags():
+    """执行延迟的分组和标签保存"""
+    global _groups_tags_save_timer
+    with _groups_tags_save_lock:
+        _groups_tags_save_timer = None
+    save_groups_and_tags()
+
+
+def schedule_save_groups_and_tags():
+    """计划在 GROUPS_TAGS_SAVE_DELAY 秒后保存分组和标签，期间的修改合并写入"""
+    global _groups_tags_save_timer
+    with _groups_tags_save_lock:
+        invalidate_stats()
+        if _groups_tags_save_timer is None:
+            _groups_tags_save_timer = threading.Timer(GROUPS_TAGS_SAVE_DELAY, _flush_groups_and_tags)
+            _groups_tags_save_timer.daemon = True
+            _groups_tags_save_timer.start()
+
+
+def flush_pending_groups_and_tags():
+    """立即写入尚未保存的分组和标签（进程退出时调用）"""
+    global _groups_tags_save_timer
+    with _groups_tags_save_lock:
+        timer, _groups_tags_save_timer = _groups_tags_save_timer, None
+    if timer is not None:
+        timer.cancel()
+        save_groups_and_tags()
+
+
+atexit.register(flush_pending_groups_and_tags)
 
 # 初始化时加载分组和标签
 load_groups_and_tags()
 
+# 管理员令牌（预先编码为字节，用于常量时间比较）
+_ADMIN_TOKEN_BYTES = b"mock_server_admin_token"
+
+# 已验证通过的认证头缓存：{Authorization头: 过期时间}
+accepted_auth_cache = {
+    "entries": {},
+    "cache_duration": 60,  # 缓存时间（秒）
+    "max_entries": 64
+}
+
 # 认证依赖
 async def get_current_user(request: Request):
     """获取当前用户"""
@@ -95,44 +302,30 @@ async def get_current_user(request: Request):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # 近期验证通过的认证头直接放行
+    now = time.time()
+    entries = accepted_auth_cache["entries"]
+    expires_at = entries.get(auth_header)
+    if expires_at is not None and now < expires_at:
+        return {"username": "admin"}
+    
     # 验证令牌
-    token = auth_header.split(" ")[1]
+    scheme, _, token = auth_header.partition(" ")
     # 这里简化处理，实际应该验证令牌的有效性
-    # 暂时使用固定的令牌验证
-    if token != "mock_server_admin_token":
+    # 暂时使用固定的令牌验证，使用常量时间比较避免时序攻击
+    if scheme != "Bearer" or not token or not hmac.compare_digest(token.encode(), _ADMIN_TOKEN_BYTES):
         raise HTTPException(
             status_code=401,
             detail="无效的认证信息",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if len(entries) >= accepted_auth_cache["max_entries"]:
+        entries.clear()
+    entries[auth_header] = now + accepted_auth_cache["cache_duration"]
     return {"username": "admin"}
 
 
-# 管理界面
-@router.get("/admin/")
-async def admin_dashboard(request: Request):
-    """管理界面"""
-    # 获取所有路由
-    routes = get_all_routes()
-    
-    # 获取最近24小时的请求历史，限制为100条
-    start_time = time.time() - (24 * 3600)
-    end_time = time.time()
-    requests = get_request_history(limit=100, start_time=start_time, end_time=end_time)
-    
-    # 渲染模板
-    return templates.TemplateResponse(
-        "admin.html",
-        {
-            "request": request,
-            "routes": routes,
-            "requests": requests[:50],
-            "config": config
-        }
-    )
-
-
 # 认证端点
 @router.post("/login")
 async def login(
@@ -155,46 +348,38 @@ async def login(
 
 
 # 路由管理
+# 路由列表支持的排序字段
+_ROUTE_SORT_KEYS = {
+    "id": lambda x: x.id,
+    "name": lambda x: x.name or "",
+    "path": lambda x: x.match_rule.path if x.match_rule else "",
+    "group": lambda x: x.group or "",
+    "created_at": lambda x: x.created_at or 0,
+}
+
+
+@functools.lru_cache(maxsize=16)
+def _sorted_routes(routes_version, sort, reverse):
+    """获取排序后的路由快照（按路由版本缓存，降序直接由升序结果反转得到）"""
+    if reverse:
+        return _sorted_routes(routes_version, sort, False)[::-1]
+    return tuple(sorted(get_all_routes(), key=_ROUTE_SORT_KEYS[sort]))
+
+
 @router.get("/admin/routes")
 async def get_routes(search: Optional[str] = None, limit: int = 1000, offset: int = 0, sort: Optional[str] = None, order: Optional[str] = None, current_user: dict = Depends(get_current_user)):
     """获取所有路由"""
-    routes = get_all_routes()
+    # 应用排序（排序结果按路由版本缓存，先排序后过滤与先过滤后排序结果一致）
+    if sort in _ROUTE_SORT_KEYS:
+        routes = _sorted_routes(get_routes_version(), sort, order == "desc")
+    else:
+        routes = get_all_routes()
     
     # 应用搜索过滤
     if search and search.strip():
+        # 检查路由名称、路径、方法和分组是否包含搜索词（基于预先小写化的搜索索引）
         search_lower = search.lower()
-        filtered_routes = []
-        for route in routes:
-            # 检查路由名称、路径、方法和分组是否包含搜索词
-            name_match = search_lower in route.name.lower() if route.name else False
-            path_match = False
-            methods_match = False
-            group_match = search_lower in route.group.lower() if route.group else False
-            
-            if route.match_rule:
-                path_match = search_lower in route.match_rule.path.lower() if route.match_rule.path else False
-                if route.match_rule.methods:
-                    methods_str = ", ".join(route.match_rule.methods).lower()
-                    methods_match = search_lower in methods_str
-            
-            if name_match or path_match or methods_match or group_match:
-                filtered_routes.append(route)
-        routes = filtered_routes
-    
-    # 应用排序
-    if sort:
-        reverse = order == "desc"
-        
-        if sort == "id":
-            routes.sort(key=lambda x: x.id, reverse=reverse)
-        elif sort == "name":
-            routes.sort(key=lambda x: x.name or "", reverse=reverse)
-        elif sort == "path":
-            routes.sort(key=lambda x: x.match_rule.path if x.match_rule else "", reverse=reverse)
-        elif sort == "group":
-            routes.sort(key=lambda x: x.group or "", reverse=reverse)
-        elif sort == "created_at":
-            routes.sort(key=lambda x: x.created_at or 0, reverse=reverse)
+        routes = [route for route in routes if search_lower in get_route_search_text(route)]
     
     # 应用分页
     total = len(routes)
@@ -217,54 +402,34 @@ async def create_route(route_create: RouteCreate, current_user: dict = Depends(g
     
     # 自动创建不存在的分组
     if route_create.group:
-        # 检查分组是否已存在
-        routes = get_all_routes()
-        existing_groups = set()
-        for route in routes:
-            if route.group:
-                existing_groups.add(route.group)
-        
         # 如果分组不存在，添加到全局集合
-        if route_create.group not in existing_groups and route_create.group not in created_groups:
+        if route_create.group not in created_groups:
             created_groups.add(route_create.group)
-            # 保存到数据库
-            save_groups_and_tags()
+            # 延迟保存到数据库
+            schedule_save_groups_and_tags()
     
     # 自动创建不存在的标签
     if route_create.tags:
-        # 检查标签是否已存在
-        routes = get_all_routes()
-        existing_tags = set()
-        for route in routes:
-            if route.tags:
-                existing_tags.update(route.tags)
-        
         # 如果标签不存在，添加到全局集合
         tags_added = False
         for tag in route_create.tags:
-            if tag not in existing_tags and tag not in created_tags:
+            if tag not in created_tags:
                 created_tags.add(tag)
                 tags_added = True
         
-        # 如果添加了新标签，保存到数据库
+        # 如果添加了新标签，延迟保存到数据库
         if tags_added:
-            save_groups_and_tags()
+            schedule_save_groups_and_tags()
     
-    # 创建路由
-    route = Route(
+    # 创建路由（route_create已在请求边界完成校验，直接构建模型，跳过重复校验）
+    now = time.time()
+    route = Route.model_construct(
         id=route_id,
-        name=route_create.name,
         enabled=True,
-        match_rule=route_create.match_rule,
-        response=route_create.response,
-        response_sequences=route_create.response_sequences,
-        enable_sequence=route_create.enable_sequence,
         current_sequence_index=0,
-        validator=route_create.validator,
-        group=route_create.group,
-        tags=route_create.tags,
-        created_at=time.time(),
-        updated_at=time.time()
+        created_at=now,
+        updated_at=now,
+        **{name: getattr(route_create, name) for name in RouteCreate.model_fields}
     )
     
     # 添加路由
@@ -276,81 +441,56 @@ async def create_route(route_create: RouteCreate, current_user: dict = Depends(g
 @router.get("/admin/routes/{route_id}", response_model=Route)
 async def get_route(route_id: str, current_user: dict = Depends(get_current_user)):
     """获取指定路由"""
-    routes = get_all_routes()
-    for route in routes:
-        if route.id == route_id:
-            return route
-    
-    raise HTTPException(status_code=404, detail="路由不存在")
+    route = get_route_by_id(route_id)
+    if not route:
+        raise HTTPException(status_code=404, detail="路由不存在")
+
+    return route
 
 
 @router.put("/admin/routes/{route_id}", response_model=Route)
 async def update_route_endpoint(route_id: str, route_update: RouteUpdate, current_user: dict = Depends(get_current_user)):
     """更新路由"""
     # 获取现有路由
-    routes = get_all_routes()
-    existing_route = None
-    for route in routes:
-        if route.id == route_id:
-            existing_route = route
-            break
-    
+    existing_route = get_route_by_id(route_id)
     if not existing_route:
         raise HTTPException(status_code=404, detail="路由不存在")
     
-    # 确定最终的分组和标签值
-    final_group = route_update.group if route_update.group is not None else existing_route.group
-    final_tags = route_update.tags if route_update.tags is not None else existing_route.tags
+    # 只更新客户端提交的字段（显式传入null视为未修改，响应序列索引由专门接口维护）
+    patch = {
+        name: getattr(route_update, name)
+        for name in route_update.model_fields_set
+        if name != "current_sequence_index" and getattr(route_update, name) is not None
+    }
+    patch["updated_at"] = time.time()
     
+    # 确定最终的分组和标签值
+    final_group = patch.get("group", existing_route.group)
+    final_tags = patch.get("tags", existing_route.tags)
+
     # 自动创建不存在的分组
     if final_group:
-        # 检查分组是否已存在
-        existing_groups = set()
-        for route in routes:
-            if route.group:
-                existing_groups.add(route.group)
-        
         # 如果分组不存在，添加到全局集合
-        if final_group not in existing_groups and final_group not in created_groups:
+        if final_group not in created_groups:
             created_groups.add(final_group)
-            # 保存到数据库
-            save_groups_and_tags()
+            # 延迟保存到数据库
+            schedule_save_groups_and_tags()
     
     # 自动创建不存在的标签
     if final_tags:
-        # 检查标签是否已存在
-        existing_tags = set()
-        for route in routes:
-            if route.tags:
-                existing_tags.update(route.tags)
-        
         # 如果标签不存在，添加到全局集合
         tags_added = False
         for tag in final_tags:
-            if tag not in existing_tags and tag not in created_tags:
+            if tag not in created_tags:
                 created_tags.add(tag)
                 tags_added = True
         
-        # 如果添加了新标签，保存到数据库
+        # 如果添加了新标签，延迟保存到数据库
         if tags_added:
-            save_groups_and_tags()
+            schedule_save_groups_and_tags()
     
-    # 更新路由
-    updated_route = Route(
-        id=route_id,
-        name=route_update.name or existing_route.name,
-        enabled=route_update.enabled if route_update.enabled is not None else existing_route.enabled,
-        match_rule=route_update.match_rule or existing_route.match_rule,
-        response=route_update.response or existing_route.response,
-        response_sequences=route_update.response_sequences if route_update.response_sequences is not None else existing_route.response_sequences,
-        enable_sequence=route_update.enable_sequence if route_update.enable_sequence is not None else existing_route.enable_sequence,
-        current_sequence_index=existing_route.current_sequence_index,
-        validator=route_update.validator or existing_route.validator,
-        group=final_group,
-        tags=final_tags,
-        created_at=existing_route.created_at,
-        updated_at=time.time()
-    )
+    # 更新路由（字段已在请求边界完成校验，直接合并，无需重新构建模型）
+    updated_route = existing_route.model_copy(update=patch)
     
     # 保存更新
     update_route(updated_route)
@@ -362,12 +502,9 @@ async def update_route_endpoint(route_id: str, route_update: RouteUpdate, curren
 async def delete_route(route_id: str, current_user: dict = Depends(get_current_user)):
     """删除路由"""
     # 检查路由是否存在
-    routes = get_all_routes()
-    route_exists = any(route.id == route_id for route in routes)
-    
-    if not route_exists:
+    if get_route_by_id(route_id) is None:
         raise HTTPException(status_code=404, detail="路由不存在")
-    
+
     # 删除路由
     remove_route(route_id)
     
@@ -378,13 +515,7 @@ async def delete_route(route_id: str, current_user: dict = Depends(get_current_u
 async def reset_sequence_counter(route_id: str, current_user: dict = Depends(get_current_user)):
     """重置响应序列计数器"""
     # 检查路由是否存在
-    routes = get_all_routes()
-    route_to_update = None
-    for route in routes:
-        if route.id == route_id:
-            route_to_update = route
-            break
-    
+    route_to_update = get_route_by_id(route_id)
     if not route_to_update:
         raise HTTPException(status_code=404, detail="路由不存在")
     
@@ -397,6 +528,41 @@ async def reset_sequence_counter(route_id: str, current_user: dict = Depends(get
     return {"message": "响应序列计数器已重置"}
 
 
+# 请求记录总数缓存（避免翻页时重复执行COUNT查询）
+request_count_cache = {
+    "entries": {},  # 缓存键 -> (更新时间, 总数)
+    "cache_duration": 5,  # 缓存5秒
+    "time_bucket": 10,  # 时间范围按10秒取整作为缓存键
+    "max_entries": 128
+}
+
+
+def _get_request_count_cached(filters, current_time):
+    """获取请求记录总数（带短时缓存），current_time 由调用方传入"""
+    bucket = request_count_cache["time_bucket"]
+    key = tuple(
+        int(value // bucket) if name in ("start_time", "end_time") and value is not None else value
+        for name, value in sorted(filters.items())
+    )
+    entries = request_count_cache["entries"]
+    cached = entries.get(key)
+    if cached and current_time - cached[0] < request_count_cache["cache_duration"]:
+        return cached[1]
+    
+    total = get_request_history_count(**filters)
+    if len(entries) >= request_count_cache["max_entries"]:
+        entries.clear()
+    entries[key] = (current_time, total)
+    return total
+
+
+def _on_request_history_reset():
+    """请求历史被清空、清理或恢复后，刷新最近请求记录并清空总数和统计缓存"""
+    reload_recent_requests()
+    request_count_cache["entries"].clear()
+    analytics_cache["entries"].clear()
+
+
 # 请求历史管理
 @router.get("/admin/requests")
 async def get_requests(
@@ -408,67 +574,54 @@ async def get_requests(
     hours: Optional[int] = None,
     sort: Optional[str] = None,
     order: Optional[str] = None,
+    after_ts: Optional[float] = None,
+    after_id: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """获取请求历史"""
+    """获取请求历史（传入after_ts/after_id时使用游标分页，忽略offset和排序参数）"""
+    now = time.time()
+    
     # 计算时间范围
     start_time = None
     end_time = None
     if hours:
-        start_time = time.time() - (hours * 3600)
-        end_time = time.time()
-    
-    # 获取请求历史，传入时间范围过滤
-    requests = get_request_history(limit=limit, offset=offset, start_time=start_time, end_time=end_time)
-    
-    # 应用过滤
-    if method:
-        requests = [r for r in requests if r.method == method]
-    if path:
-        requests = [r for r in requests if path in r.path]
-    if status_code:
-        requests = [r for r in requests if r.response_status == status_code]
-    
-    # 应用排序
-    if sort:
-        reverse = order == "desc"
-        
-        if sort == "timestamp":
-            requests.sort(key=lambda x: x.timestamp, reverse=reverse)
-        elif sort == "method":
-            requests.sort(key=lambda x: x.method, reverse=reverse)
-        elif sort == "path":
-            requests.sort(key=lambda x: x.path, reverse=reverse)
-        elif sort == "response_status":
-            requests.sort(key=lambda x: x.response_status, reverse=reverse)
-        elif sort == "response_time":
-            requests.sort(key=lambda x: x.response_time, reverse=reverse)
-        elif sort == "client_ip":
-            requests.sort(key=lambda x: x.client_ip, reverse=reverse)
+        end_time = now
+        start_time = end_time - (hours * 3600)
+    
+    # 获取请求历史，过滤、排序和分页均在数据库中完成（先在线程中等待排队的历史记录写入）
+    await flush_history_writes_async()
+    filters = {"start_time": start_time, "end_time": end_time, "method": method, "path": path, "status_code": status_code}
+    requests = get_request_history(limit=limit, offset=offset, sort=sort, order=order,
+                                   after_ts=after_ts, after_id=after_id, **filters)
+    
+    # 下一页游标（仅在按时间倒序分页时有效）
+    next_cursor = None
+    if len(requests) == limit and (after_ts is not None or sort is None):
+        last = requests[-1]
+        next_cursor = {"after_ts": last.timestamp, "after_id": last.id}
     
     # 获取总记录数
-    total = get_request_history_count(start_time=start_time, end_time=end_time)
+    total = _get_request_count_cached(filters, now)
     
     return {
         "items": requests,
         "total": total,
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_cursor": next_cursor
     }
 
 
 @router.get("/admin/requests/{request_id}")
 async def get_request(request_id: str, current_user: dict = Depends(get_current_user)):
     """获取指定请求"""
-    from app.storage.database import db_storage
-    
-    # 从数据库中获取请求记录
-    req = db_storage.get_request_by_id(request_id)
+    # 优先从内存索引中获取请求记录，不存在时再查询数据库
+    req = request_by_id.get(request_id) or db_storage.get_request_by_id(request_id)
     if not req:
         raise HTTPException(status_code=404, detail="请求不存在")
     
-    # 从数据库中获取对应的响应记录
-    response = db_storage.get_response_by_request_id(request_id)
+    # 获取对应的响应记录
+    response = response_by_request_id.get(request_id) or db_storage.get_response_by_request_id(request_id)
     
     return {
         "request": req,
@@ -479,39 +632,54 @@ async def get_request(request_id: str, current_user: dict = Depends(get_current_
 @router.delete("/admin/requests")
 async def clear_requests(current_user: dict = Depends(get_current_user)):
     """清空请求历史"""
-    from app.api.mock import request_history, response_history
-    from app.storage.database import db_storage
-    
+    # 先写完排队中的历史记录，避免清空后又被写回数据库
+    await flush_history_writes_async()
     # 清空内存中的历史记录
-    request_history.clear()
-    response_history.clear()
+    clear_history()
     
     # 清空数据库中的历史记录
     db_storage.clear_requests()
+    _on_request_history_reset()
     
     return {"message": "请求历史清空成功"}
 
 
 # 服务配置管理
+# 支持的环境列表
+_ENVS = ("default", "development", "testing", "production")
+
+
+# 服务配置快照缓存：(配置对象ID, 配置字典)
+_config_snapshot: Optional[Tuple[int, dict]] = None
+
+
+def _invalidate_config_snapshot():
+    """配置变更后使配置快照失效"""
+    global _config_snapshot
+    _config_snapshot = None
+
+
 @router.get("/config")
 async def get_config(current_user: dict = Depends(get_current_user)):
     """获取服务配置"""
-    return {
-        "server": config.server.model_dump(),
-        "admin": config.admin.model_dump(),
-        "storage": config.storage.model_dump(),
-        "proxy": config.proxy.model_dump(),
-        "log": config.log.model_dump()
-    }
+    global _config_snapshot
+    if _config_snapshot is None or _config_snapshot[0] != id(config):
+        _config_snapshot = (id(config), {
+            "server": config.server.model_dump(),
+            "admin": config.admin.model_dump(),
+            "storage": config.storage.model_dump(),
+            "proxy": config.proxy.model_dump(),
+            "log": config.log.model_dump()
+        })
+    return _config_snapshot[1]
 
 
 @router.put("/config")
 async def update_config(config_update: dict, current_user: dict = Depends(get_current_user)):
     """更新服务配置"""
-    from app.services.config_manager import config_manager
-    
     # 保存配置更新
     config_manager.save_config(config_update)
+    _invalidate_config_snapshot()
     
     return {"message": "配置更新成功", "config": config_update}
 
@@ -519,8 +687,6 @@ async def update_config(config_update: dict, current_user: dict = Depends(get_cu
 @router.post("/config/backup")
 async def backup_config(env: str = 'default', backup_name: Optional[str] = None, current_user: dict = Depends(get_current_user)):
     """备份配置"""
-    from app.services.config_manager import config_manager
-    
     backup_file = config_manager.backup_config(env, backup_name)
     return {"message": "配置备份成功", "backup_file": backup_file}
 
@@ -528,9 +694,8 @@ async def backup_config(env: str = 'default', backup_name: Optional[str] = None,
 @router.post("/config/restore")
 async def restore_config(backup_file: str, env: str = 'default', current_user: dict = Depends(get_current_user)):
     """从备份恢复配置"""
-    from app.services.config_manager import config_manager
-    
     success = config_manager.restore_config(backup_file, env)
+    _invalidate_config_snapshot()
     if success:
         return {"message": "配置恢复成功"}
     else:
@@ -540,8 +705,6 @@ async def restore_config(backup_file: str, env: str = 'default', current_user: d
 @router.get("/config/backups")
 async def get_backups(current_user: dict = Depends(get_current_user)):
     """获取所有备份"""
-    from app.services.config_manager import config_manager
-    
     backups = config_manager.get_all_backups()
     return backups
 
@@ -549,8 +712,6 @@ async def get_backups(current_user: dict = Depends(get_current_user)):
 @router.get("/config/history")
 async def get_config_history(env: str = 'default', limit: int = 10, current_user: dict = Depends(get_current_user)):
     """获取配置变更历史"""
-    from app.services.config_manager import config_manager
-    
     history = config_manager.get_config_history(env, limit)
     return history
 
@@ -558,9 +719,8 @@ async def get_config_history(env: str = 'default', limit: int = 10, current_user
 @router.post("/config/switch")
 async def switch_env(env: str, current_user: dict = Depends(get_current_user)):
     """切换环境"""
-    from app.services.config_manager import config_manager
-    
     success = config_manager.switch_env(env)
+    _invalidate_config_snapshot()
     if success:
         return {"message": "环境切换成功", "env": env}
     else:
@@ -570,30 +730,7 @@ async def switch_env(env: str, current_user: dict = Depends(get_current_user)):
 @router.get("/config/envs")
 async def get_envs(current_user: dict = Depends(get_current_user)):
     """获取所有环境"""
-    from app.services.config_manager import config_manager
-    
-    envs = ['default', 'development', 'testing', 'production']
-    return {"envs": envs, "current_env": config_manager.get_current_env()}
-
-
-# 管理界面
-@router.get("/admin/ui", response_class=HTMLResponse)
-async def admin_ui(request: Request):
-    """管理界面"""
-    # 获取最近24小时的请求历史，限制为100条
-    start_time = time.time() - (24 * 3600)
-    end_time = time.time()
-    requests = get_request_history(limit=100, start_time=start_time, end_time=end_time)
-    
-    return templates.TemplateResponse(
-        "admin.html",
-        {
-            "request": request,
-            "routes": get_all_routes(),
-            "requests": requests[:50],
-            "config": config
-        }
-    )
+    return {"envs": _ENVS, "current_env": config_manager.get_current_env()}
 
 
 # 数据管理
@@ -605,17 +742,15 @@ async def cleanup_data(
     current_user: dict = Depends(get_current_user)
 ):
     """清理数据"""
-    from app.services.data_manager import data_manager
-    
+    await flush_history_writes_async()
     result = data_manager.cleanup_requests(max_age_days, max_records, archive)
+    _on_request_history_reset()
     return {"message": "数据清理完成", "result": result}
 
 
 @router.get("/data/archives")
 async def get_archives(current_user: dict = Depends(get_current_user)):
     """获取所有归档"""
-    from app.services.data_manager import data_manager
-    
     archives = data_manager.get_archives()
     return archives
 
@@ -623,9 +758,9 @@ async def get_archives(current_user: dict = Depends(get_current_user)):
 @router.post("/data/restore")
 async def restore_archive(archive_file: str, current_user: dict = Depends(get_current_user)):
     """从归档恢复数据"""
-    from app.services.data_manager import data_manager
-    
+    await flush_history_writes_async()
     success = data_manager.restore_archive(archive_file)
+    _on_request_history_reset()
     if success:
         return {"message": "归档恢复成功"}
     else:
@@ -635,8 +770,6 @@ async def restore_archive(archive_file: str, current_user: dict = Depends(get_cu
 @router.delete("/data/archives/{archive_file}")
 async def delete_archive(archive_file: str, current_user: dict = Depends(get_current_user)):
     """删除归档"""
-    from app.services.data_manager import data_manager
-    
     # 构建完整路径
     full_path = os.path.join(os.path.dirname(config.storage.db_path), 'archives', archive_file)
     success = data_manager.delete_archive(full_path)
@@ -649,8 +782,6 @@ async def delete_archive(archive_file: str, current_user: dict = Depends(get_cur
 @router.get("/data/cleanup/strategy")
 async def get_cleanup_strategy(current_user: dict = Depends(get_current_user)):
     """获取清理策略"""
-    from app.services.data_manager import data_manager
-    
     strategy = data_manager.get_cleanup_strategy()
     return strategy
 
@@ -658,8 +789,6 @@ async def get_cleanup_strategy(current_user: dict = Depends(get_current_user)):
 @router.put("/data/cleanup/strategy")
 async def set_cleanup_strategy(strategy: dict, current_user: dict = Depends(get_current_user)):
     """设置清理策略"""
-    from app.services.data_manager import data_manager
-    
     success = data_manager.set_cleanup_strategy(strategy)
     if success:
         return {"message": "清理策略设置成功", "strategy": strategy}
@@ -670,176 +799,149 @@ async def set_cleanup_strategy(strategy: dict, current_user: dict = Depends(get_
 @router.post("/data/cleanup/auto")
 async def run_auto_cleanup(current_user: dict = Depends(get_current_user)):
     """运行自动清理"""
-    from app.services.data_manager import data_manager
-    
+    await flush_history_writes_async()
     result = data_manager.run_auto_cleanup()
+    _on_request_history_reset()
     return {"message": "自动清理完成", "result": result}
 
 
 # 数据统计和分析
-@router.get("/admin/analytics/request-trend")
-async def get_request_trend(hours: int = 24, interval: str = 'hour', current_user: dict = Depends(get_current_user)):
-    """获取请求趋势"""
-    from app.services.analytics import analytics_manager
-    
-    trend = analytics_manager.get_request_trend(hours, interval)
-    return trend
-
+# 统计指标名称 -> 统计函数
+_ANALYTICS = {
+    "request-trend": lambda q: analytics_manager.get_request_trend(q["hours"], q["interval"]),
+    "response-time": lambda q: analytics_manager.get_response_time_stats(q["hours"]),
+    "status-codes": lambda q: analytics_manager.get_status_code_stats(q["hours"]),
+    "methods": lambda q: analytics_manager.get_method_stats(q["hours"]),
+    "paths": lambda q: analytics_manager.get_path_stats(q["hours"], q["limit"]),
+    "summary": lambda q: analytics_manager.get_summary_stats(),
+}
+
+# 统计结果缓存
+analytics_cache = {
+    "entries": {},  # (指标, hours, interval, limit) -> (更新时间, 结果)
+    "cache_duration": 30,  # 缓存30秒
+    "max_entries": 64
+}
+
+
+@router.get("/admin/analytics/{metric}")
+async def get_analytics(metric: str, hours: int = 24, interval: str = 'hour', limit: int = 10, current_user: dict = Depends(get_current_user)):
+    """获取统计数据（请求趋势、响应时间、状态码、请求方法、路径及汇总统计）"""
+    fn = _ANALYTICS.get(metric)
+    if fn is None:
+        raise HTTPException(status_code=404, detail="统计指标不存在")
+    
+    # 统计结果变化缓慢，短时间内的重复查询直接使用缓存
+    key = (metric, hours, interval, limit)
+    current_time = time.time()
+    entries = analytics_cache["entries"]
+    cached = entries.get(key)
+    if cached and current_time - cached[0] < analytics_cache["cache_duration"]:
+        return cached[1]
+    
+    await flush_history_writes_async()
+    result = fn({"hours": hours, "interval": interval, "limit": limit})
+    if len(entries) >= analytics_cache["max_entries"]:
+        entries.clear()
+    entries[key] = (current_time, result)
+    return result
 
-@router.get("/admin/analytics/response-time")
-async def get_response_time_stats(hours: int = 24, current_user: dict = Depends(get_current_user)):
-    """获取响应时间统计"""
-    from app.services.analytics import analytics_manager
-    
-    stats = analytics_manager.get_response_time_stats(hours)
-    return stats
 
+# 测试路由
+@router.get("/admin/test")
+async def test_route():
+    """测试路由"""
+    return {"message": "测试成功"}
 
-@router.get("/admin/analytics/status-codes")
-async def get_status_code_stats(hours: int = 24, current_user: dict = Depends(get_current_user)):
-    """获取状态码统计"""
-    from app.services.analytics import analytics_manager
+# 导出路由
+# 导出时读取的字段，一次调用取出全部值（匹配规则和响应只保留必要的子字段）
+_export_fields = operator.attrgetter(
+    "name", "enabled", "group", "tags", "validator",
+    "match_rule.path", "match_rule.methods",
+    "response.status_code", "response.content", "response.delay", "response.headers",
+)
+
+
+def _route_export_dict(route):
+    """将路由转换为可序列化的导出格式，与导入格式兼容"""
+    (name, enabled, group, tags, validator,
+     path, methods, status_code, content, delay, headers) = _export_fields(route)
+    
+    # 响应字段名转换：status_code -> status，头部仅在有值时导出
+    response_data = {"status": status_code, "content": content, "delay": delay}
+    if headers:
+        response_data["headers"] = headers
+    
+    # 构建路由对象，与 sample-routes.json 格式一致
+    route_dict = {
+        "name": name,
+        "match_rule": {"path": path, "methods": methods},
+        "response": response_data,
+        "enabled": enabled,
+        "group": group,
+        "tags": tags or [],
+    }
     
-    stats = analytics_manager.get_status_code_stats(hours)
-    return stats
-
-
-@router.get("/admin/analytics/methods")
-async def get_method_stats(hours: int = 24, current_user: dict = Depends(get_current_user)):
-    """获取请求方法统计"""
-    from app.services.analytics import analytics_manager
+    # 只在有值时添加 validator 字段
+    if validator is not None:
+        route_dict["validator"] = validator.model_dump()
     
-    stats = analytics_manager.get_method_stats(hours)
-    return stats
+    return route_dict
 
 
-@router.get("/admin/analytics/paths")
-async def get_path_stats(hours: int = 24, limit: int = 10, current_user: dict = Depends(get_current_user)):
-    """获取路径统计"""
-    from app.services.analytics import analytics_manager
-    
-    stats = analytics_manager.get_path_stats(hours, limit)
-    return stats
+def _iter_routes_export(routes, pretty: bool = False):
+    """逐条序列化路由，生成 JSON 数组的字节片段（默认紧凑格式，pretty时缩进）"""
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    yield b"[\n"
+    for index, route in enumerate(routes):
+        if index:
+            yield b",\n"
+        yield orjson.dumps(_route_export_dict(route), option=option)
+    yield b"\n]"
 
 
-@router.get("/admin/analytics/summary")
-async def get_summary_stats(current_user: dict = Depends(get_current_user)):
-    """获取汇总统计"""
-    from app.services.analytics import analytics_manager
-    
-    stats = analytics_manager.get_summary_stats()
-    return stats
+# 导出内容缓存：{是否缩进: (路由版本号, 原始JSON, gzip压缩后的JSON)}
+_export_cache: Dict[bool, Tuple[int, bytes, bytes]] = {}
 
 
-# 测试路由
-@router.get("/admin/test")
-async def test_route():
-    """测试路由"""
-    return {"message": "测试成功"}
+def _get_export_payload(pretty: bool = True):
+    """获取导出内容，路由未变化时直接使用缓存"""
+    routes_version = get_routes_version()
+    cached = _export_cache.get(pretty)
+    if cached is None or cached[0] != routes_version:
+        raw_json = b"".join(_iter_routes_export(get_all_routes(), pretty))
+        cached = (routes_version, raw_json, gzip.compress(raw_json, compresslevel=6))
+        _export_cache[pretty] = cached
+    return cached
+
 
-# 导出路由
 @router.get("/admin/routes-export")
-async def export_routes():
-    """导出所有路由为 JSON 文件"""
-    from fastapi.responses import Response
-    import json
-    import time
-    
-    # 获取所有路由
-    routes = get_all_routes()
-    
-    # 转换为可序列化的格式，与导入格式兼容
-    routes_data = []
-    for route in routes:
-        # 处理响应对象，确保格式与导入兼容
-        response_data = {}
-        if hasattr(route.response, 'model_dump'):
-            raw_response = route.response.model_dump()
-            # 转换字段名：status_code -> status
-            if 'status_code' in raw_response:
-                response_data['status'] = raw_response['status_code']
-            elif 'status' in raw_response:
-                response_data['status'] = raw_response['status']
-            # 复制内容字段
-            if 'content' in raw_response:
-                response_data['content'] = raw_response['content']
-            # 复制延迟字段
-            if 'delay' in raw_response:
-                response_data['delay'] = raw_response['delay']
-            # 复制头部字段
-            if 'headers' in raw_response and raw_response['headers']:
-                response_data['headers'] = raw_response['headers']
-        else:
-            # 直接使用原始响应数据
-            response_data = route.response
-        
-        # 处理匹配规则
-        match_rule_data = {}
-        if hasattr(route.match_rule, 'model_dump'):
-            raw_match_rule = route.match_rule.model_dump()
-            # 只保留必要的字段
-            if 'path' in raw_match_rule:
-                match_rule_data['path'] = raw_match_rule['path']
-            if 'methods' in raw_match_rule:
-                match_rule_data['methods'] = raw_match_rule['methods']
-        else:
-            match_rule_data = route.match_rule
-        
-        # 构建路由对象，与 sample-routes.json 格式一致
-        route_dict = {
-            "name": route.name,
-            "match_rule": match_rule_data,
-            "response": response_data,
-            "enabled": route.enabled,
-            "group": route.group,
-            "tags": route.tags if route.tags else []
-        }
-        
-        # 只在有值时添加 validator 字段
-        if route.validator:
-            if hasattr(route.validator, 'model_dump'):
-                route_dict['validator'] = route.validator.model_dump()
-            else:
-                route_dict['validator'] = route.validator
-        
-        routes_data.append(route_dict)
-    
-    # 生成 JSON 字符串
-    json_str = json.dumps(routes_data, indent=2, ensure_ascii=False)
-    
+async def export_routes(request: Request, pretty: bool = True):
+    """导出所有路由为 JSON 文件（默认缩进格式，pretty=0 时输出紧凑格式）"""
     # 生成文件名
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     filename = f"routes_export_{timestamp}.json"
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Vary": "Accept-Encoding"
+    }
     
-    # 返回 JSON 文件
-    return Response(
-        content=json_str,
-        media_type="application/json",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
-    )
+    _, raw_json, gzip_json = _get_export_payload(pretty)
+    
+    # 客户端支持gzip时直接返回预压缩的内容
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=gzip_json, media_type="application/json", headers=headers)
+    
+    return Response(content=raw_json, media_type="application/json", headers=headers)
 
 
 # 分组管理
 @router.get("/admin/groups")
 async def get_groups(limit: int = 10, offset: int = 0, current_user: dict = Depends(get_current_user)):
     """获取所有分组"""
-    routes = get_all_routes()
-    
-    # 统计分组使用次数
-    group_stats = {}
-    for route in routes:
-        if route.group:
-            if route.group in group_stats:
-                group_stats[route.group] += 1
-            else:
-                group_stats[route.group] = 1
-    
-    # 添加所有已创建但还没有关联路由的分组
-    for group_name in created_groups:
-        if group_name not in group_stats:
-            group_stats[group_name] = 0
+    # 统计分组使用次数（含已创建但还没有关联路由的分组，结果缓存）
+    group_stats = _get_group_stats()
     
     # 转换为列表格式
     groups = []
@@ -849,12 +951,9 @@ async def get_groups(limit: int = 10, offset: int = 0, current_user: dict = Depe
             "count": count
         })
     
-    # 按使用次数排序
-    groups.sort(key=lambda x: x['count'], reverse=True)
-    
-    # 应用分页
+    # 按使用次数取出当前页所需的前N项并分页（与完整排序后切片结果一致）
     total = len(groups)
-    groups = groups[offset:offset + limit]
+    groups = heapq.nlargest(offset + limit, groups, key=_count_key)[offset:offset + limit]
     
     # 返回带有分页信息的数据结构
     return {
@@ -868,15 +967,8 @@ async def get_groups(limit: int = 10, offset: int = 0, current_user: dict = Depe
 @router.post("/admin/groups")
 async def create_group(group_name: str = Form(..., description="分组名称"), current_user: dict = Depends(get_current_user)):
     """创建分组"""
-    # 检查分组是否已存在
-    routes = get_all_routes()
-    existing_groups = set()
-    for route in routes:
-        if route.group:
-            existing_groups.add(route.group)
-    
-    # 检查是否在已创建的分组中
-    if group_name in existing_groups or group_name in created_groups:
+    # 检查分组是否已存在（路由使用中或已创建）
+    if group_name in _get_group_stats() or group_name in created_groups:
         # 返回409 Conflict状态码，表示资源已存在
         raise HTTPException(status_code=409, detail="分组名称已存在")
     
@@ -898,15 +990,12 @@ async def update_group(old_name: str, request_data: dict = Body(..., description
     if not new_name:
         raise HTTPException(status_code=400, detail="新分组名称不能为空")
     
-    routes = get_all_routes()
-    
-    # 更新所有使用该分组的路由
-    updated_count = 0
-    for route in routes:
-        if route.group == old_name:
-            route.group = new_name
-            update_route(route)
-            updated_count += 1
+    # 更新所有使用该分组的路由（通过反向索引查找，在线程中批量写入数据库，不阻塞事件循环）
+    to_update = get_routes_by_group(old_name)
+    for route in to_update:
+        route.group = new_name
+    await bulk_save_routes(to_update)
+    updated_count = len(to_update)
     
     # 更新已创建分组集合中的分组名称
     if old_name in created_groups:
@@ -922,15 +1011,12 @@ async def update_group(old_name: str, request_data: dict = Body(..., description
 @router.delete("/admin/groups/{group_name}")
 async def delete_group(group_name: str, current_user: dict = Depends(get_current_user)):
     """删除分组"""
-    routes = get_all_routes()
-    
-    # 移除所有使用该分组的路由的分组信息
-    updated_count = 0
-    for route in routes:
-        if route.group == group_name:
-            route.group = None
-            update_route(route)
-            updated_count += 1
+    # 移除所有使用该分组的路由的分组信息（通过反向索引查找，在线程中批量写入数据库，不阻塞事件循环）
+    to_update = get_routes_by_group(group_name)
+    for route in to_update:
+        route.group = None
+    await bulk_save_routes(to_update)
+    updated_count = len(to_update)
     
     # 从已创建分组集合中移除该分组
     if group_name in created_groups:
@@ -946,22 +1032,8 @@ async def delete_group(group_name: str, current_user: dict = Depends(get_current
 @router.get("/admin/tags")
 async def get_tags(limit: int = 10, offset: int = 0, current_user: dict = Depends(get_current_user)):
     """获取所有标签"""
-    routes = get_all_routes()
-    
-    # 统计标签使用次数
-    tag_stats = {}
-    for route in routes:
-        if route.tags:
-            for tag in route.tags:
-                if tag in tag_stats:
-                    tag_stats[tag] += 1
-                else:
-                    tag_stats[tag] = 1
-    
-    # 添加所有已创建但还没有关联路由的标签
-    for tag_name in created_tags:
-        if tag_name not in tag_stats:
-            tag_stats[tag_name] = 0
+    # 统计标签使用次数（含已创建但还没有关联路由的标签，结果缓存）
+    tag_stats = _get_tag_stats()
     
     # 转换为列表格式
     tags = []
@@ -971,12 +1043,9 @@ async def get_tags(limit: int = 10, offset: int = 0, current_user: dict = Depend
             "count": count
         })
     
-    # 按使用次数排序
-    tags.sort(key=lambda x: x['count'], reverse=True)
-    
-    # 应用分页
+    # 按使用次数取出当前页所需的前N项并分页（与完整排序后切片结果一致）
     total = len(tags)
-    tags = tags[offset:offset + limit]
+    tags = heapq.nlargest(offset + limit, tags, key=_count_key)[offset:offset + limit]
     
     # 返回带有分页信息的数据结构
     return {
@@ -990,15 +1059,8 @@ async def get_tags(limit: int = 10, offset: int = 0, current_user: dict = Depend
 @router.post("/admin/tags")
 async def create_tag(tag_name: str = Form(..., description="标签名称"), current_user: dict = Depends(get_current_user)):
     """创建标签"""
-    # 检查标签是否已存在
-    routes = get_all_routes()
-    existing_tags = set()
-    for route in routes:
-        if route.tags:
-            existing_tags.update(route.tags)
-    
-    # 检查是否在已创建的标签中
-    if tag_name in existing_tags or tag_name in created_tags:
+    # 检查标签是否已存在（路由使用中或已创建）
+    if tag_name in _get_tag_stats() or tag_name in created_tags:
         # 返回409 Conflict状态码，表示资源已存在
         raise HTTPException(status_code=409, detail="标签名称已存在")
     
@@ -1020,16 +1082,13 @@ async def update_tag(old_name: str, request_data: dict = Body(..., description="
     if not new_name:
         raise HTTPException(status_code=400, detail="新标签名称不能为空")
     
-    routes = get_all_routes()
-    
-    # 更新所有使用该标签的路由
-    updated_count = 0
-    for route in routes:
-        if route.tags and old_name in route.tags:
-            # 替换标签名称
-            route.tags = [new_name if tag == old_name else tag for tag in route.tags]
-            update_route(route)
-            updated_count += 1
+    # 更新所有使用该标签的路由（通过反向索引查找，在线程中批量写入数据库，不阻塞事件循环）
+    to_update = get_routes_by_tag(old_name)
+    for route in to_update:
+        # 替换标签名称
+        route.tags = [new_name if tag == old_name else tag for tag in route.tags]
+    await bulk_save_routes(to_update)
+    updated_count = len(to_update)
     
     # 更新已创建标签集合中的标签名称
     if old_name in created_tags:
@@ -1045,16 +1104,13 @@ async def update_tag(old_name: str, request_data: dict = Body(..., description="
 @router.delete("/admin/tags/{tag_name}")
 async def delete_tag(tag_name: str, current_user: dict = Depends(get_current_user)):
     """删除标签"""
-    routes = get_all_routes()
-    
-    # 移除所有使用该标签的路由的标签信息
-    updated_count = 0
-    for route in routes:
-        if route.tags and tag_name in route.tags:
-            # 移除标签
-            route.tags = [tag for tag in route.tags if tag != tag_name]
-            update_route(route)
-            updated_count += 1
+    # 移除所有使用该标签的路由的标签信息（通过反向索引查找，在线程中批量写入数据库，不阻塞事件循环）
+    to_update = get_routes_by_tag(tag_name)
+    for route in to_update:
+        # 移除标签
+        route.tags = [tag for tag in route.tags if tag != tag_name]
+    await bulk_save_routes(to_update)
+    updated_count = len(to_update)
     
     # 从已创建标签集合中移除该标签
     if tag_name in created_tags:
@@ -1070,46 +1126,33 @@ async def delete_tag(tag_name: str, current_user: dict = Depends(get_current_use
 @router.get("/admin/groups/search")
 async def search_groups(query: str, limit: int = 10, offset: int = 0, exact: bool = False, current_user: dict = Depends(get_current_user)):
     """搜索分组（支持精准查询和模糊查询）"""
-    routes = get_all_routes()
-    
-    # 统计分组使用次数
-    group_stats = {}
-    for route in routes:
-        if route.group:
-            if route.group in group_stats:
-                group_stats[route.group] += 1
-            else:
-                group_stats[route.group] = 1
-    
-    # 添加所有已创建但还没有关联路由的分组
-    for group_name in created_groups:
-        if group_name not in group_stats:
-            group_stats[group_name] = 0
+    # 统计分组使用次数（含已创建但还没有关联路由的分组，结果缓存）
+    stats = _compute_stats()
+    group_stats = stats["groups"]
     
     # 过滤匹配的分组
     matched_groups = []
-    if query:
+    if query and exact:
+        # 精准查询：完全匹配分组名称，直接按名称查找
+        if query in group_stats:
+            matched_groups.append({"name": query, "count": group_stats[query]})
+    elif query:
+        # 模糊查询：部分匹配分组名称
+        # 直接遍历预先小写化的名称，循环内只有一次子串判断
         query_lower = query.lower()
-        for group_name, count in group_stats.items():
-            if exact:
-                # 精准查询：完全匹配分组名称
-                if group_name == query:
-                    matched_groups.append({"name": group_name, "count": count})
-            else:
-                # 模糊查询：部分匹配分组名称
-                if query_lower in group_name.lower():
-                    matched_groups.append({"name": group_name, "count": count})
+        matched_groups = [
+            {"name": group_name, "count": group_stats[group_name]}
+            for group_name, name_lower in stats["groups_lower"].items()
+            if query_lower in name_lower
+        ]
     else:
         # 没有查询参数时，返回所有分组
         for group_name, count in group_stats.items():
             matched_groups.append({"name": group_name, "count": count})
     
-    # 按使用次数排序
-    matched_groups.sort(key=lambda x: x['count'], reverse=True)
-    
-    # 应用分页
+    # 按使用次数取出当前页所需的前N项并分页（与完整排序后切片结果一致）
     total = len(matched_groups)
-    matched_groups = matched_groups[offset:offset + limit]
+    matched_groups = heapq.nlargest(offset + limit, matched_groups, key=_count_key)[offset:offset + limit]
     
     # 返回带有分页信息的数据结构
     return {
@@ -1123,47 +1166,33 @@ async def search_groups(query: str, limit: int = 10, offset: int = 0, exact: boo
 @router.get("/admin/tags/search")
 async def search_tags(query: str, limit: int = 10, offset: int = 0, exact: bool = False, current_user: dict = Depends(get_current_user)):
     """搜索标签（支持精准查询和模糊查询）"""
-    routes = get_all_routes()
-    
-    # 统计标签使用次数
-    tag_stats = {}
-    for route in routes:
-        if route.tags:
-            for tag in route.tags:
-                if tag in tag_stats:
-                    tag_stats[tag] += 1
-                else:
-                    tag_stats[tag] = 1
-    
-    # 添加所有已创建但还没有关联路由的标签
-    for tag_name in created_tags:
-        if tag_name not in tag_stats:
-            tag_stats[tag_name] = 0
+    # 统计标签使用次数（含已创建但还没有关联路由的标签，结果缓存）
+    stats = _compute_stats()
+    tag_stats = stats["tags"]
     
     # 过滤匹配的标签
     matched_tags = []
-    if query:
+    if query and exact:
+        # 精准查询：完全匹配标签名称，直接按名称查找
+        if query in tag_stats:
+            matched_tags.append({"name": query, "count": tag_stats[query]})
+    elif query:
+        # 模糊查询：部分匹配标签名称
+        # 直接遍历预先小写化的名称，循环内只有一次子串判断
         query_lower = query.lower()
-        for tag_name, count in tag_stats.items():
-            if exact:
-                # 精准查询：完全匹配标签名称
-                if tag_name == query:
-                    matched_tags.append({"name": tag_name, "count": count})
-            else:
-                # 模糊查询：部分匹配标签名称
-                if query_lower in tag_name.lower():
-                    matched_tags.append({"name": tag_name, "count": count})
+        matched_tags = [
+            {"name": tag_name, "count": tag_stats[tag_name]}
+            for tag_name, name_lower in stats["tags_lower"].items()
+            if query_lower in name_lower
+        ]
     else:
         # 没有查询参数时，返回所有标签
         for tag_name, count in tag_stats.items():
             matched_tags.append({"name": tag_name, "count": count})
     
-    # 按使用次数排序
-    matched_tags.sort(key=lambda x: x['count'], reverse=True)
-    
-    # 应用分页
+    # 按使用次数取出当前页所需的前N项并分页（与完整排序后切片结果一致）
     total = len(matched_tags)
-    matched_tags = matched_tags[offset:offset + limit]
+    matched_tags = heapq.nlargest(offset + limit, matched_tags, key=_count_key)[offset:offset + limit]
     
     # 返回带有分页信息的数据结构
     return {
@@ -1,9 +1,10 @@
 import time
-import json
+import hashlib
+import orjson
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import Response, StreamingResponse
 from app.models.response import HealthResponse
-from app.api.mock import get_server_uptime, get_request_history
+from app.api.mock import get_server_uptime, get_request_aggregates
 from app.core.config import config
 
 # 创建路由处理实例
@@ -13,17 +14,179 @@ router = APIRouter()
 health_cache = {
     "last_update": 0,
     "response": None,
+    "etag": None,
     "cache_duration": 5  # 缓存5秒
 }
 
+# 运行指标缓存（缓存序列化后的字节，按输出格式分别缓存）
+metrics_cache = {
+    "last_update": 0,
+    "metrics": None,
+    "content": {},  # 输出格式 -> 字节
+    "cache_duration": 1  # 缓存1秒
+}
+
+# Prometheus 文本格式的媒体类型
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# 健康检查页面的静态头部（含样式）和尾部，导入时预先编码，每次请求只需格式化动态部分
+_HEALTH_HTML_HEAD = '''<!DOCTYPE html>
+<html>
+<head>
+    <title>Health Check</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            background-color: white;
+            padding: 30px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        h1 {
+            text-align: center;
+            margin-bottom: 30px;
+        }
+        .health-status {
+            text-align: center;
+            margin: 20px 0;
+            padding: 20px;
+            border-radius: 8px;
+            font-size: 18px;
+            font-weight: bold;
+        }
+        .healthy {
+            background-color: #d4edda;
+            color: #155724;
+            border: 1px solid #c3e6cb;
+        }
+        .unhealthy {
+            background-color: #f8d7da;
+            color: #721c24;
+            border: 1px solid #f5c6cb;
+        }
+        .json-content {
+            background-color: #f8f9fa;
+            padding: 20px;
+            border-radius: 8px;
+            border: 1px solid #dee2e6;
+            margin: 20px 0;
+            font-family: monospace;
+            white-space: pre-wrap;
+            word-wrap: break-word;
+        }
+        .stats {
+            margin: 20px 0;
+        }
+        .stat-item {
+            margin: 10px 0;
+            padding: 10px;
+            background-color: #f8f9fa;
+            border-radius: 4px;
+        }
+        .stat-label {
+            font-weight: bold;
+            margin-right: 10px;
+        }
+        .back-link {
+            display: block;
+            text-align: center;
+            margin-top: 30px;
+            text-decoration: none;
+            color: #4a90e2;
+            font-weight: bold;
+        }
+        .back-link:hover {
+            text-decoration: underline;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>健康检查</h1>
+'''.encode()
+
+_HEALTH_HTML_TAIL = '''        </div>
+        <a href="/" class="back-link">返回首页</a>
+    </div>
+</body>
+</html>
+'''.encode()
+
+
+def _build_stats(aggregates, uptime):
+    """根据请求历史统计信息构建健康检查的统计数据"""
+    return {
+        "total_requests": aggregates["total_requests"],
+        "recent_requests": aggregates["recent_requests"],
+        "status_code_distribution": aggregates["status_code_distribution"],
+        "uptime_seconds": uptime,
+        "proxy_enabled": config.proxy.enable,
+        "admin_enabled": config.admin.enable
+    }
+
+
+def _build_metrics(aggregates, uptime, server_time):
+    """根据请求历史统计信息构建运行指标"""
+    total_requests = aggregates["total_requests"]
+    
+    # 计算平均响应时间
+    avg_response_time = aggregates["total_response_time"] / total_requests if total_requests > 0 else 0
+    
+    return {
+        "uptime_seconds": uptime,
+        "total_requests": total_requests,
+        "average_response_time": avg_response_time,
+        "method_distribution": aggregates["method_distribution"],
+        "server_time": server_time,
+        "config": {
+            "host": config.server.host,
+            "port": config.server.port,
+            "enable_https": config.server.enable_https
+        }
+    }
+
+
+async def _iter_health_html(body):
+    """逐段输出健康检查页面：静态头部、动态内容、静态尾部"""
+    yield _HEALTH_HTML_HEAD
+    yield body
+    yield _HEALTH_HTML_TAIL
+
+
+def _health_etag(aggregates, uptime):
+    """根据请求统计和运行时间（取整到秒）计算健康检查的弱ETag"""
+    state = (
+        aggregates["total_requests"],
+        aggregates["recent_requests"],
+        sorted(aggregates["status_code_distribution"].items()),
+        int(uptime),
+        config.proxy.enable,
+        config.admin.enable,
+    )
+    return 'W/"%s"' % hashlib.blake2b(repr(state).encode(), digest_size=8).hexdigest()
+
 
 @router.get("/health")
 async def health_check(request: Request):
     """健康检查端点"""
-    # 检查缓存
+    # 检查是否需要返回 JSON 还是 HTML
+    wants_html = "text/html" in request.headers.get("accept", "")
+    
+    if_none_match = request.headers.get("if-none-match")
+    
+    # 检查缓存（缓存的是 JSON 响应，HTML 请求不使用）
     current_time = time.time()
-    if current_time - health_cache["last_update"] < health_cache["cache_duration"] and health_cache["response"]:
-        # 如果缓存有效，直接返回缓存的响应
+    if not wants_html and current_time - health_cache["last_update"] < health_cache["cache_duration"] and health_cache["response"]:
+        # 如果缓存有效，直接返回缓存的响应，客户端已有相同内容时返回304
+        if if_none_match == health_cache["etag"]:
+            return Response(status_code=304, headers={"ETag": health_cache["etag"]})
         return health_cache["response"]
     
     # 打印请求信息，找出频繁调用的来源
@@ -31,34 +194,16 @@ async def health_check(request: Request):
     user_agent = request.headers.get("user-agent", "unknown")
     print(f"Health check requested from {client_host} with user agent: {user_agent}")
     
-    # 获取服务运行时间
+    # 获取服务运行时间和统计信息
     uptime = get_server_uptime()
+    aggregates = get_request_aggregates(recent_window=300)
     
-    # 获取请求历史，计算统计信息
-    request_history = get_request_history()
-    total_requests = len(request_history)
-    
-    # 计算最近5分钟的请求数
-    from datetime import datetime
-    five_minutes_ago = time.time() - 300
-    recent_requests = len([r for r in request_history if r.timestamp > five_minutes_ago])
-    
-    # 计算请求状态码分布
-    status_code_counts = {}
-    for req in request_history:
-        if req.response_status:
-            status_code = req.response_status
-            status_code_counts[status_code] = status_code_counts.get(status_code, 0) + 1
+    # 统计信息未变化时返回304，无需构建和序列化响应
+    etag = _health_etag(aggregates, uptime)
+    if not wants_html and if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
     
-    # 构建统计信息
-    stats = {
-        "total_requests": total_requests,
-        "recent_requests": recent_requests,
-        "status_code_distribution": status_code_counts,
-        "uptime_seconds": uptime,
-        "proxy_enabled": config.proxy.enable,
-        "admin_enabled": config.admin.enable
-    }
+    stats = _build_stats(aggregates, uptime)
     
     # 构建健康检查响应
     response = HealthResponse(
@@ -68,192 +213,125 @@ async def health_check(request: Request):
         stats=stats
     )
     
-    # 检查是否需要返回 JSON 还是 HTML
-    accept_header = request.headers.get("accept", "")
-    if "text/html" in accept_header:
+    if wants_html:
         # 返回 HTML 页面
         health_data = response.model_dump()
         is_healthy = health_data.get("status") == "healthy"
         
-        # 生成 JSON 字符串
-        json_str = json.dumps(health_data, indent=2, ensure_ascii=False)
+        # 生成 JSON 字符串（状态码分布的键为整数，需要 OPT_NON_STR_KEYS）
+        json_str = orjson.dumps(health_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
         
-        # 构建 HTML 内容
-        html_content = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Health Check</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                    background-color: #f5f5f5;
-                }}
-                .container {{
-                    background-color: white;
-                    padding: 30px;
-                    border-radius: 8px;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                }}
-                h1 {{
-                    text-align: center;
-                    margin-bottom: 30px;
-                }}
-                .health-status {{
-                    text-align: center;
-                    margin: 20px 0;
-                    padding: 20px;
-                    border-radius: 8px;
-                    font-size: 18px;
-                    font-weight: bold;
-                }}
-                .healthy {{
-                    background-color: #d4edda;
-                    color: #155724;
-                    border: 1px solid #c3e6cb;
-                }}
-                .unhealthy {{
-                    background-color: #f8d7da;
-                    color: #721c24;
-                    border: 1px solid #f5c6cb;
-                }}
-                .json-content {{
-                    background-color: #f8f9fa;
-                    padding: 20px;
-                    border-radius: 8px;
-                    border: 1px solid #dee2e6;
-                    margin: 20px 0;
-                    font-family: monospace;
-                    white-space: pre-wrap;
-                    word-wrap: break-word;
-                }}
-                .stats {{
-                    margin: 20px 0;
-                }}
-                .stat-item {{
-                    margin: 10px 0;
-                    padding: 10px;
-                    background-color: #f8f9fa;
-                    border-radius: 4px;
-                }}
-                .stat-label {{
-                    font-weight: bold;
-                    margin-right: 10px;
-                }}
-                .back-link {{
-                    display: block;
-                    text-align: center;
-                    margin-top: 30px;
-                    text-decoration: none;
-                    color: #4a90e2;
-                    font-weight: bold;
-                }}
-                .back-link:hover {{
-                    text-decoration: underline;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>健康检查</h1>
-                <div class="health-status {'healthy' if is_healthy else 'unhealthy'}">
-                    服务状态: {'健康' if is_healthy else '不健康'}
-                </div>
-                <div class="stats">
-                    <div class="stat-item">
-                        <span class="stat-label">版本:</span> {health_data.get('version')}
-                    </div>
-                    <div class="stat-item">
-                        <span class="stat-label">运行时间:</span> {health_data.get('uptime', 0):.2f} 秒
-                    </div>
-                    <div class="stat-item">
-                        <span class="stat-label">总请求数:</span> {health_data.get('stats', {}).get('total_requests', 0)}
-                    </div>
-                    <div class="stat-item">
-                        <span class="stat-label">最近5分钟请求数:</span> {health_data.get('stats', {}).get('recent_requests', 0)}
-                    </div>
-                </div>
-                <h2>详细信息</h2>
-                <div class="json-content">
-                    {json_str}
-                </div>
-                <a href="/" class="back-link">返回首页</a>
+        # 构建 HTML 内容（只格式化动态部分，静态头部和尾部预先编码）
+        status_class = 'healthy' if is_healthy else 'unhealthy'
+        status_text = '健康' if is_healthy else '不健康'
+        html_body = f'''        <div class="health-status {status_class}">
+            服务状态: {status_text}
+        </div>
+        <div class="stats">
+            <div class="stat-item">
+                <span class="stat-label">版本:</span> {health_data.get('version')}
+            </div>
+            <div class="stat-item">
+                <span class="stat-label">运行时间:</span> {health_data.get('uptime', 0):.2f} 秒
             </div>
-        </body>
-        </html>
-        '''
+            <div class="stat-item">
+                <span class="stat-label">总请求数:</span> {stats.get('total_requests', 0)}
+            </div>
+            <div class="stat-item">
+                <span class="stat-label">最近5分钟请求数:</span> {stats.get('recent_requests', 0)}
+            </div>
+        </div>
+        <h2>详细信息</h2>
+        <div class="json-content">
+            {json_str}
+'''
         
-        return HTMLResponse(content=html_content)
+        return StreamingResponse(_iter_health_html(html_body.encode()), media_type="text/html")
     else:
         # 返回 JSON 响应
-        json_response = JSONResponse(content=response.model_dump())
+        json_response = Response(
+            content=orjson.dumps(response.model_dump(), option=orjson.OPT_NON_STR_KEYS),
+            media_type="application/json",
+            headers={"ETag": etag}
+        )
         # 缓存响应
         health_cache["response"] = json_response
+        health_cache["etag"] = etag
         health_cache["last_update"] = time.time()
         return json_response
 
 
+def _escape_label(value):
+    """转义 Prometheus 标签值"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_prometheus_metrics(metrics):
+    """将运行指标转换为 Prometheus 文本格式"""
+    lines = [
+        "# HELP mock_server_uptime_seconds Server uptime in seconds.",
+        "# TYPE mock_server_uptime_seconds gauge",
+        f"mock_server_uptime_seconds {metrics['uptime_seconds']}",
+        "# HELP mock_server_history_requests Requests in the in-memory request history.",
+        "# TYPE mock_server_history_requests gauge",
+        f"mock_server_history_requests {metrics['total_requests']}",
+        "# HELP mock_server_average_response_time_seconds Average response time of requests in the history.",
+        "# TYPE mock_server_average_response_time_seconds gauge",
+        f"mock_server_average_response_time_seconds {metrics['average_response_time']}",
+        "# HELP mock_server_history_requests_by_method Requests in the history by HTTP method.",
+        "# TYPE mock_server_history_requests_by_method gauge",
+    ]
+    for method, count in metrics["method_distribution"].items():
+        lines.append(f'mock_server_history_requests_by_method{{method="{_escape_label(method)}"}} {count}')
+    lines.append("")
+    return "\n".join(lines).encode()
+
+
 @router.get("/metrics")
-async def get_metrics():
-    """获取服务运行指标"""
-    # 获取服务运行时间
-    uptime = get_server_uptime()
-    
-    # 获取请求历史
-    request_history = get_request_history()
-    total_requests = len(request_history)
-    
-    # 计算平均响应时间
-    total_response_time = sum(req.response_time for req in request_history if req.response_time)
-    avg_response_time = total_response_time / total_requests if total_requests > 0 else 0
+async def get_metrics(request: Request):
+    """获取服务运行指标（Accept 为 text/plain 时返回 Prometheus 文本格式）"""
+    prometheus = "text/plain" in request.headers.get("accept", "")
+    media_type = PROMETHEUS_MEDIA_TYPE if prometheus else "application/json"
     
-    # 计算请求方法分布
-    method_counts = {}
-    for req in request_history:
-        method = req.method
-        method_counts[method] = method_counts.get(method, 0) + 1
+    # 检查缓存，过期时重新构建指标
+    current_time = time.time()
+    if current_time - metrics_cache["last_update"] >= metrics_cache["cache_duration"] or metrics_cache["metrics"] is None:
+        metrics_cache["metrics"] = _build_metrics(get_request_aggregates(), get_server_uptime(), current_time)
+        metrics_cache["content"] = {}
+        metrics_cache["last_update"] = current_time
     
-    # 构建指标响应
-    metrics = {
-        "uptime_seconds": uptime,
-        "total_requests": total_requests,
-        "average_response_time": avg_response_time,
-        "method_distribution": method_counts,
-        "server_time": time.time(),
-        "config": {
-            "host": config.server.host,
-            "port": config.server.port,
-            "enable_https": config.server.enable_https
-        }
+    # 每种格式只序列化一次并缓存字节
+    content = metrics_cache["content"].get(media_type)
+    if content is None:
+        metrics = metrics_cache["metrics"]
+        content = _render_prometheus_metrics(metrics) if prometheus else orjson.dumps(metrics)
+        metrics_cache["content"][media_type] = content
+    return Response(content=content, media_type=media_type)
+
+
+# 服务信息（内容固定，导入时预先序列化）
+_INFO_BYTES = orjson.dumps({
+    "name": "Mock Server",
+    "version": "V1.0.0",
+    "description": "企业级 Python Mock Server",
+    "features": [
+        "Dynamic routing",
+        "RESTful API support",
+        "Request validation",
+        "Template-based responses",
+        "Request history",
+        "Proxy mode",
+        "Health checks"
+    ],
+    "endpoints": {
+        "health": "/health",
+        "metrics": "/metrics",
+        "info": "/info"
     }
-    
-    return JSONResponse(content=metrics)
+})
 
 
 @router.get("/info")
 async def get_service_info():
     """获取服务信息"""
-    info = {
-        "name": "Mock Server",
-        "version": "V1.0.0",
-        "description": "企业级 Python Mock Server",
-        "features": [
-            "Dynamic routing",
-            "RESTful API support",
-            "Request validation",
-            "Template-based responses",
-            "Request history",
-            "Proxy mode",
-            "Health checks"
-        ],
-        "endpoints": {
-            "health": "/health",
-            "metrics": "/metrics",
-            "info": "/info"
-        }
-    }
-    
-    return JSONResponse(content=info)
+    return Response(content=_INFO_BYTES, media_type="application/json")
@@ -1,10 +1,18 @@
 from fastapi import APIRouter, Request, Response
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from typing import Optional, Any
 import asyncio
+import atexit
+import httpx
+import orjson
+import queue
+import random
+import threading
 import time
 import uuid
 import json
+from collections import Counter, deque
 from app.services.router import Router
 from app.services.validator import Validator
 from app.services.templater import Templater
@@ -16,6 +24,14 @@ from app.models.response import Response as ResponseModel
 # 创建路由处理实例
 router = APIRouter()
 
+
+class MockJSONResponse(ORJSONResponse):
+    """使用orjson序列化的JSON响应（与标准库json一致，允许非字符串的字典键）"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 # 服务实例
 mock_router = Router()
 validator = Validator()
@@ -24,12 +40,35 @@ templater = Templater()
 # 导入数据库存储
 from app.storage.database import db_storage
 
-# 请求和响应历史（内存中保留最近1000条，用于快速访问）
-request_history = []
-response_history = []
+# 代理转发目标（配置在运行期间不会变化，启动时读取一次；未启用代理时为None）
+PROXY_TARGET_URL = config.proxy.target_url if config.proxy.enable else None
+
+# 请求和响应历史（内存中保留最近 history_size 条，用于快速访问，超出后自动淘汰最早的记录）
+REQUEST_HISTORY_LIMIT = config.storage.history_size
+request_history = deque(maxlen=REQUEST_HISTORY_LIMIT)
+response_history = deque(maxlen=REQUEST_HISTORY_LIMIT)
+
+# 内存请求历史的统计信息，随请求历史的追加和淘汰增量维护，供健康检查和运行指标使用
+status_counter = Counter()
+method_counter = Counter()
+response_time_total = 0.0
+# 最近请求的时间戳（按时间顺序），与请求历史同长度上限，读取时再淘汰过期的记录
+recent_timestamps = deque(maxlen=REQUEST_HISTORY_LIMIT)
+
+# 内存历史记录索引：请求ID -> 请求记录 / 响应记录，与上面的历史列表同步维护
+request_by_id = {}
+response_by_request_id = {}
+
+# 最近的请求记录（供管理界面展示，按时间顺序，最新的在末尾）
+RECENT_REQUESTS_LIMIT = 50
+recent_requests = deque(maxlen=RECENT_REQUESTS_LIMIT)
+
+# 请求历史版本号，每次记录或清理请求历史时递增，用于缓存失效判断
+request_history_version = 0
 
 # 服务启动时间
 server_start_time = time.time()
+server_start_monotonic = time.monotonic()
 
 # 从数据库加载路由
 def load_routes_from_db():
@@ -42,32 +81,65 @@ def load_routes_from_db():
 load_routes_from_db()
 
 
+def _headers_to_dict(raw_headers):
+    """将原始请求头列表转换为字典（同名头部保留第一个值，与dict(request.headers)一致）
+    
+    dict(request.headers)会对每个键线性扫描全部头部，这里只遍历一次。
+    """
+    headers = {}
+    for key, value in raw_headers:
+        headers.setdefault(key.decode("latin-1"), value.decode("latin-1"))
+    return headers
+
+
+def _build_context(route_response, method, path, headers, query_params, body, client_ip, path_params):
+    """构建模板渲染使用的请求上下文，响应内容不含模板变量时无需构建，返回None"""
+    if templater.is_static(route_response.content):
+        return None
+    return {
+        "request": {
+            "method": method,
+            "path": path,
+            "headers": headers,
+            "query_params": query_params,
+            "body": body,
+            "client_ip": client_ip
+        },
+        "path": path_params,
+        "query": query_params,
+        "body": body or {}
+    }
+
+
 @router.api_route("/api/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"])
 async def mock_handler(request: Request, path: str):
     """Mock API请求处理"""
     # 生成请求ID
-    request_id = str(uuid.uuid4())
+    request_id = uuid.uuid4().hex
     
-    # 记录请求开始时间
+    # 记录请求开始时间（墙上时间用于记录时间戳，单调时钟用于计算响应时间）
     start_time = time.time()
+    mono_start = time.monotonic()
     
     # 构建完整路径
     full_path = f"/api/{path}"
     
     # 获取请求信息
     method = request.method
-    headers = dict(request.headers)
-    query_params = dict(request.query_params)
+    headers = _headers_to_dict(request.headers.raw)
+    query_params = dict(request.query_params) if request.scope.get("query_string") else {}
     
-    # 获取请求体
-    try:
-        body = await request.json()
-    except:
+    # 获取请求体（空请求体不解析，非JSON请求体按表单解析）
+    body = None
+    raw_body = await request.body()
+    if raw_body:
         try:
-            body = await request.form()
-            body = dict(body)
-        except:
-            body = None
+            body = json.loads(raw_body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            try:
+                body = dict(await request.form())
+            except Exception:
+                body = None
     
     # 获取客户端IP
     client_ip = request.client.host if request.client else "unknown"
@@ -75,26 +147,11 @@ async def mock_handler(request: Request, path: str):
     # 记录请求开始
     logger.info(f"Request started [{request_id}]: {method} {full_path} from {client_ip}")
     
-    # 构建请求上下文
-    context = {
-        "request": {
-            "method": method,
-            "path": full_path,
-            "headers": headers,
-            "query_params": query_params,
-            "body": body,
-            "client_ip": client_ip
-        }
-    }
-    
     # 匹配路由
     matched_route = mock_router.match_route(method, full_path, headers, query_params, body)
     
     if matched_route:
         route, path_params = matched_route
-        context["path"] = path_params
-        context["query"] = query_params
-        context["body"] = body or {}
         
         logger.info(f"Route matched [{request_id}]: {route.name} ({route.id})")
         
@@ -105,9 +162,11 @@ async def mock_handler(request: Request, path: str):
                 # 生成验证错误响应
                 logger.warning(f"Request validation failed [{request_id}]: {error_msg}")
                 if route.validator.error_response:
+                    context = _build_context(route.validator.error_response, method, full_path, headers,
+                                             query_params, body, client_ip, path_params)
                     response = await generate_response(route.validator.error_response, context)
                 else:
-                    response = JSONResponse(
+                    response = MockJSONResponse(
                         status_code=400,
                         content={"error": error_msg}
                     )
@@ -115,7 +174,7 @@ async def mock_handler(request: Request, path: str):
                 # 记录请求和响应
                 await record_request_and_response(
                     request_id, start_time, method, full_path, headers, query_params, body, 
-                    client_ip, route.id, 400, response
+                    client_ip, route.id, 400, response, mono_start
                 )
                 
                 logger.info(f"Request completed [{request_id}]: 400 Bad Request")
@@ -129,21 +188,22 @@ async def mock_handler(request: Request, path: str):
             # 确保索引在有效范围内
             if current_index < len(route.response_sequences):
                 response_to_use = route.response_sequences[current_index]
-                # 更新序列索引（循环）
+                # 更新序列索引（循环），只修改内存中的路由，延迟批量保存到数据库
                 route.current_sequence_index = (current_index + 1) % len(route.response_sequences)
-                # 保存更新后的路由
-                db_storage.save_route(route)
-                # 更新内存中的路由
-                mock_router.update_route(route)
+                schedule_save_sequence_index(route.id, route.current_sequence_index)
                 logger.info(f"Response sequence used [{request_id}]: index {current_index} for route {route.name}")
         
-        # 生成响应
-        response = await generate_response(response_to_use, context)
+        # 生成响应（静态路由直接使用预先编码的响应体）
+        response = _get_static_response(route)
+        if response is None:
+            context = _build_context(response_to_use, method, full_path, headers,
+                                     query_params, body, client_ip, path_params)
+            response = await generate_response(response_to_use, context)
         
         # 记录请求和响应
         await record_request_and_response(
             request_id, start_time, method, full_path, headers, query_params, body, 
-            client_ip, route.id, response.status_code, response
+            client_ip, route.id, response.status_code, response, mono_start
         )
         
         logger.info(f"Request completed [{request_id}]: {response.status_code}")
@@ -151,22 +211,23 @@ async def mock_handler(request: Request, path: str):
     else:
         # 处理未匹配的请求
         logger.info(f"No route matched [{request_id}]: {method} {full_path}")
-        if config.proxy.enable and config.proxy.target_url:
+        if PROXY_TARGET_URL:
             # 代理模式：转发到真实后端
-            logger.info(f"Forwarding to proxy [{request_id}]: {config.proxy.target_url}")
+            logger.info(f"Forwarding to proxy [{request_id}]: {PROXY_TARGET_URL}")
             response = await proxy_request(method, full_path, headers, query_params, body)
             
-            # 记录请求和响应
-            await record_request_and_response(
+            # 记录请求和响应（代理响应是流式的，发送完毕后才能取得响应内容，因此在后台任务中记录）
+            response.background = BackgroundTask(
+                record_request_and_response,
                 request_id, start_time, method, full_path, headers, query_params, body, 
-                client_ip, None, response.status_code, response
+                client_ip, None, response.status_code, response, mono_start
             )
             
             logger.info(f"Proxy request completed [{request_id}]: {response.status_code}")
             return response
         else:
             # 返回404
-            response = JSONResponse(
+            response = MockJSONResponse(
                 status_code=404,
                 content={"error": "No matching route found"}
             )
@@ -174,17 +235,117 @@ async def mock_handler(request: Request, path: str):
             # 记录请求和响应
             await record_request_and_response(
                 request_id, start_time, method, full_path, headers, query_params, body, 
-                client_ip, None, 404, response
+                client_ip, None, 404, response, mono_start
             )
             
             logger.info(f"Request completed [{request_id}]: 404 Not Found")
             return response
 
 
+# 响应序列索引的延迟保存：路由ID -> 最新的序列索引，延迟期间合并，到期后批量写入数据库
+SEQUENCE_SAVE_DELAY = 5.0
+_dirty_sequence_routes = {}
+_sequence_save_timer = None
+_sequence_save_lock = threading.Lock()
+
+
+def _flush_sequence_indexes():
+    """执行延迟的序列索引保存"""
+    global _sequence_save_timer
+    with _sequence_save_lock:
+        _sequence_save_timer = None
+        indexes = list(_dirty_sequence_routes.items())
+        _dirty_sequence_routes.clear()
+    # 只更新序列索引字段：已删除的路由不会被写回，其他字段也不会覆盖事件循环中的修改
+    if indexes:
+        try:
+            db_storage.update_sequence_indexes(indexes)
+        except Exception as e:
+            logger.error(f"Failed to save response sequence indexes: {str(e)}")
+
+
+def schedule_save_sequence_index(route_id, index):
+    """计划在 SEQUENCE_SAVE_DELAY 秒后保存路由的序列索引，期间的多次变化合并写入"""
+    global _sequence_save_timer
+    with _sequence_save_lock:
+        _dirty_sequence_routes[route_id] = index
+        if _sequence_save_timer is None:
+            _sequence_save_timer = threading.Timer(SEQUENCE_SAVE_DELAY, _flush_sequence_indexes)
+            _sequence_save_timer.daemon = True
+            _sequence_save_timer.start()
+
+
+def flush_pending_sequence_indexes():
+    """立即写入尚未保存的序列索引（进程退出时调用）"""
+    global _sequence_save_timer
+    with _sequence_save_lock:
+        timer, _sequence_save_timer = _sequence_save_timer, None
+    if timer is not None:
+        timer.cancel()
+        _flush_sequence_indexes()
+
+
+atexit.register(flush_pending_sequence_indexes)
+
+
+# 静态路由的预编码响应：路由ID -> (路由, 路由响应配置, (响应体, 原始响应头, 是否为JSON) 或 None)
+_static_responses = {}
+
+
+class _PrebuiltResponse(Response):
+    """使用预先编码的响应体和响应头创建的响应，跳过响应头的规范化和编码"""
+    
+    def __init__(self, body: bytes, status_code: int, raw_headers):
+        self.body = body
+        self.status_code = status_code
+        self.background = None
+        # 复制响应头列表（中间件会原地修改响应头）
+        self.raw_headers = list(raw_headers)
+
+
+def _get_static_response(route):
+    """为静态路由构建响应（无验证器、响应序列、延迟、错误模拟和模板变量），否则返回None
+    
+    响应体和响应头在首次使用时编码并按路由对象缓存，之后每次请求只需创建响应对象。
+    """
+    route_response = route.response
+    cached = _static_responses.get(route.id)
+    if cached is None or cached[0] is not route or cached[1] is not route_response:
+        prebuilt = None
+        if (not route.validator
+                and not (route.enable_sequence and route.response_sequences)
+                and route_response.delay <= 0
+                and not route_response.delay_range
+                and not route_response.simulate_error
+                and templater.is_static(route_response.content)):
+            is_json = route_response.content_type == "application/json"
+            response_class = MockJSONResponse if is_json else PlainTextResponse
+            template = response_class(
+                content=route_response.content if is_json else str(route_response.content),
+                status_code=route_response.status_code,
+                headers=route_response.headers or {}
+            )
+            prebuilt = (template.body, tuple(template.raw_headers), is_json)
+        cached = (route, route_response, prebuilt)
+        _static_responses[route.id] = cached
+    
+    prebuilt = cached[2]
+    if prebuilt is None:
+        return None
+    # 每次请求创建新的响应对象（中间件会修改响应头，不能共享同一个对象）
+    response = _PrebuiltResponse(prebuilt[0], route_response.status_code, prebuilt[1])
+    if prebuilt[2]:
+        response.raw_content = route_response.content
+    response.applied_delay = 0.0
+    return response
+
+
+# 响应内容中含模板变量的字符串达到该数量时，改为在线程中渲染
+RENDER_IN_THREAD_THRESHOLD = 200
+
+
 async def generate_response(route_response, context):
     """生成响应"""
-    import random
-    
     # 应用延迟
     applied_delay = 0.0
     if route_response.delay > 0:
@@ -201,18 +362,19 @@ async def generate_response(route_response, context):
         # 根据错误概率决定是否发生错误
         if random.random() <= route_response.error_probability:
             if route_response.error_type == "timeout":
-                # 模拟超时（长时间延迟）
-                await asyncio.sleep(30)  # 30秒超时
-                response = JSONResponse(
+                # 模拟超时（等待期间占用一个请求任务，等待时间为0时立即返回）
+                if route_response.timeout_duration > 0:
+                    await asyncio.sleep(route_response.timeout_duration)
+                response = MockJSONResponse(
                     status_code=408,
                     content={"error": "Request Timeout"}
                 )
                 # 记录应用的延迟
-                response.applied_delay = applied_delay + 30
+                response.applied_delay = applied_delay + max(route_response.timeout_duration, 0.0)
                 return response
             elif route_response.error_type == "network_error":
                 # 模拟网络错误
-                response = JSONResponse(
+                response = MockJSONResponse(
                     status_code=503,
                     content={"error": "Service Unavailable"}
                 )
@@ -221,7 +383,7 @@ async def generate_response(route_response, context):
                 return response
             elif route_response.error_type == "server_error":
                 # 模拟服务器错误
-                response = JSONResponse(
+                response = MockJSONResponse(
                     status_code=500,
                     content={"error": "Internal Server Error"}
                 )
@@ -229,16 +391,21 @@ async def generate_response(route_response, context):
                 response.applied_delay = applied_delay
                 return response
     
-    # 渲染响应内容
-    rendered_content = templater.render_response(route_response.content, context)
+    # 渲染响应内容（模板变量较多时在线程中渲染，避免长时间阻塞事件循环）
+    if templater.template_count(route_response.content) >= RENDER_IN_THREAD_THRESHOLD:
+        rendered_content = await asyncio.to_thread(templater.render_response, route_response.content, context)
+    else:
+        rendered_content = templater.render_response(route_response.content, context)
     
     # 根据内容类型创建响应
     if route_response.content_type == "application/json":
-        response = JSONResponse(
+        response = MockJSONResponse(
             status_code=route_response.status_code,
             content=rendered_content,
             headers=route_response.headers or {}
         )
+        # 保留渲染后的内容，记录历史时无需再从响应体反序列化
+        response.raw_content = rendered_content
     else:
         response = PlainTextResponse(
             status_code=route_response.status_code,
@@ -251,11 +418,71 @@ async def generate_response(route_response, context):
     return response
 
 
+# 请求/响应历史的后台批量写入：请求处理中只入队，由后台线程将积压的记录合并为单个事务写入数据库
+HISTORY_WRITE_BATCH_SIZE = 100
+_history_queue = queue.Queue(maxsize=10000)
+_history_writer_thread = None
+_history_writer_lock = threading.Lock()
+
+
+def _history_writer():
+    """后台写入线程：取出队列中积压的记录（最多一批），在单个事务中写入数据库"""
+    while True:
+        batch = [_history_queue.get()]
+        while len(batch) < HISTORY_WRITE_BATCH_SIZE:
+            try:
+                batch.append(_history_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            db_storage.save_history([item[0] for item in batch], [item[1] for item in batch])
+        except Exception as e:
+            logger.error(f"Failed to save request history: {str(e)}")
+        finally:
+            for _ in batch:
+                _history_queue.task_done()
+
+
+def _enqueue_history(request_record, response_record):
+    """将请求和响应记录加入后台写入队列（首次调用时启动写入线程）"""
+    global _history_writer_thread
+    if _history_writer_thread is None:
+        with _history_writer_lock:
+            if _history_writer_thread is None:
+                _history_writer_thread = threading.Thread(target=_history_writer, name="history-writer", daemon=True)
+                _history_writer_thread.start()
+    try:
+        _history_queue.put_nowait((request_record, response_record))
+    except queue.Full:
+        # 队列已满时直接同步写入，避免丢失记录
+        db_storage.save_history([request_record], [response_record])
+
+
+def flush_history_writes():
+    """等待后台写入队列中的记录全部写入数据库（读取或清理数据库中的请求历史前调用）
+    
+    会阻塞调用线程，异步处理函数应先 await flush_history_writes_async()，此时这里会立即返回
+    """
+    _history_queue.join()
+
+
+async def flush_history_writes_async():
+    """在线程中等待后台写入队列清空，供异步处理函数调用，不阻塞事件循环"""
+    await asyncio.to_thread(_history_queue.join)
+
+
+# 进程退出前写入尚未保存的记录
+atexit.register(flush_history_writes)
+
+
 async def record_request_and_response(request_id, start_time, method, path, headers, query_params, body, 
-                                     client_ip, route_id, status_code, response):
-    """记录请求和响应"""
-    # 计算响应时间
-    response_time = time.time() - start_time
+                                     client_ip, route_id, status_code, response, mono_start=None):
+    """记录请求和响应（mono_start为请求开始时的单调时钟读数，用于计算响应时间）"""
+    # 计算响应时间（不受系统时间调整影响）
+    if mono_start is not None:
+        response_time = time.monotonic() - mono_start
+    else:
+        response_time = time.time() - start_time
     
     # 记录请求
     request_record = RequestModel(
@@ -271,29 +498,32 @@ async def record_request_and_response(request_id, start_time, method, path, head
         response_status=status_code,
         response_time=response_time
     )
-    # 保存到内存
+    # 保存到内存，历史已满时追加会淘汰最早的记录，同步移出索引和统计
+    if len(request_history) == REQUEST_HISTORY_LIMIT:
+        evicted = request_history[0]
+        request_by_id.pop(evicted.id, None)
+        _count_request(evicted, -1)
     request_history.append(request_record)
-    # 保存到数据库
-    db_storage.save_request(request_record)
-    
-    # 限制历史记录数量
-    if len(request_history) > 1000:
-        request_history.pop(0)
+    request_by_id[request_id] = request_record
+    recent_requests.append(request_record)
+    _count_request(request_record)
+    recent_timestamps.append(start_time)
+    mark_request_history_changed()
     
-    # 记录响应
-    response_id = str(uuid.uuid4())
+    # 记录响应（响应与请求一一对应，响应ID由请求ID派生）
+    response_id = request_id + "r"
     
-    # 尝试解析响应内容为JSON对象（如果是JSON内容）
+    # 优先使用生成响应时保留的内容，否则尝试将响应体解析为JSON对象（如果是JSON内容）
     content = None
-    if hasattr(response, 'body'):
-        content_str = response.body.decode()
-        # 尝试解析JSON
+    if hasattr(response, 'raw_content'):
+        content = response.raw_content
+    elif hasattr(response, 'body'):
+        # 尝试解析JSON（orjson直接解析字节，无需先解码）
         try:
-            import json
-            content = json.loads(content_str)
-        except json.JSONDecodeError:
-            # 如果不是JSON，保持原始字符串
-            content = content_str
+            content = orjson.loads(response.body)
+        except orjson.JSONDecodeError:
+            # 如果不是JSON，保持原始字符串（无法解码的字节用替换字符表示）
+            content = response.body.decode('utf-8', 'replace')
     
     # 获取应用的延迟
     delay_applied = getattr(response, 'applied_delay', 0.0)
@@ -301,7 +531,7 @@ async def record_request_and_response(request_id, start_time, method, path, head
     response_record = ResponseModel(
         id=response_id,
         request_id=request_id,
-        timestamp=time.time(),
+        timestamp=start_time + response_time,
         status_code=status_code,
         headers=dict(response.headers),
         content=content,
@@ -310,65 +540,114 @@ async def record_request_and_response(request_id, start_time, method, path, head
         delay_applied=delay_applied  # 记录实际应用的延迟
     )
     # 保存到内存
+    if len(response_history) == REQUEST_HISTORY_LIMIT:
+        evicted = response_history[0]
+        response_by_request_id.pop(evicted.request_id, None)
     response_history.append(response_record)
-    # 保存到数据库
-    db_storage.save_response(response_record)
-    
-    # 限制历史记录数量
-    if len(response_history) > 1000:
-        response_history.pop(0)
+    response_by_request_id[request_id] = response_record
+    # 由后台线程批量保存到数据库
+    _enqueue_history(request_record, response_record)
+
+
+# 代理转发共享的HTTP客户端（复用连接池），以及创建它的事件循环
+PROXY_MAX_CONNECTIONS = 500
+PROXY_MAX_KEEPALIVE_CONNECTIONS = 100
+_proxy_client = None
+_proxy_client_loop = None
+
+
+def _get_proxy_client():
+    """获取代理转发使用的共享客户端，首次使用或事件循环变化时重新创建"""
+    global _proxy_client, _proxy_client_loop
+    loop = asyncio.get_running_loop()
+    if _proxy_client is None or _proxy_client.is_closed or _proxy_client_loop is not loop:
+        # 连接池绑定在事件循环上，不能跨循环复用
+        _proxy_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(
+                max_connections=PROXY_MAX_CONNECTIONS,
+                max_keepalive_connections=PROXY_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+        _proxy_client_loop = loop
+    return _proxy_client
+
+
+async def close_proxy_client():
+    """服务关闭时释放代理客户端的连接池"""
+    global _proxy_client, _proxy_client_loop
+    if _proxy_client is not None and _proxy_client_loop is asyncio.get_running_loop():
+        await _proxy_client.aclose()
+    _proxy_client = None
+    _proxy_client_loop = None
+
+
+# 支持代理转发的HTTP方法，以及其中转发请求体的方法
+PROXY_METHODS = frozenset(("GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"))
+PROXY_BODY_METHODS = frozenset(("POST", "PUT", "PATCH"))
+# 代理响应内容在请求历史中最多保留的字节数
+PROXY_CAPTURE_LIMIT = 64 * 1024
+# 逐跳头部只对单个连接有效，不转发给客户端
+_HOP_BY_HOP_HEADERS = frozenset((
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade",
+))
+
+
+async def _stream_proxy_body(upstream, captured: bytearray):
+    """逐块转发后端响应内容，同时保留开头的部分内容用于记录请求历史"""
+    try:
+        async for chunk in upstream.aiter_raw():
+            if len(captured) < PROXY_CAPTURE_LIMIT:
+                captured += chunk[:PROXY_CAPTURE_LIMIT - len(captured)]
+            yield chunk
+    finally:
+        await upstream.aclose()
 
 
 async def proxy_request(method: str, path: str, headers: dict, query_params: dict, body: Any):
     """代理请求到真实后端"""
-    import httpx
-    
     # 构建目标URL
-    target_url = f"{config.proxy.target_url}{path}"
+    target_url = f"{PROXY_TARGET_URL}{path}"
     
     # 移除host头部，由httpx自动设置
     headers.pop('host', None)
     
     logger.info(f"Proxying request: {method} {target_url}")
     
-    # 发送请求
-    async with httpx.AsyncClient() as client:
-        try:
-            if method == "GET":
-                response = await client.get(target_url, headers=headers, params=query_params)
-            elif method == "POST":
-                response = await client.post(target_url, headers=headers, params=query_params, json=body)
-            elif method == "PUT":
-                response = await client.put(target_url, headers=headers, params=query_params, json=body)
-            elif method == "DELETE":
-                response = await client.delete(target_url, headers=headers, params=query_params)
-            elif method == "PATCH":
-                response = await client.patch(target_url, headers=headers, params=query_params, json=body)
-            elif method == "HEAD":
-                response = await client.head(target_url, headers=headers, params=query_params)
-            elif method == "OPTIONS":
-                response = await client.options(target_url, headers=headers, params=query_params)
-            else:
-                logger.warning(f"Proxying unsupported method: {method}")
-                return JSONResponse(
-                    status_code=405,
-                    content={"error": "Method not allowed"}
-                )
-            
-            logger.info(f"Proxy response received: {response.status_code} from {target_url}")
-            
-            # 构建响应
-            return Response(
-                content=response.content,
-                status_code=response.status_code,
-                headers=dict(response.headers)
-            )
-        except Exception as e:
-            logger.error(f"Proxy error: {str(e)} for {target_url}")
-            return JSONResponse(
-                status_code=502,
-                content={"error": f"Proxy error: {str(e)}"}
-            )
+    if method not in PROXY_METHODS:
+        logger.warning(f"Proxying unsupported method: {method}")
+        return MockJSONResponse(
+            status_code=405,
+            content={"error": "Method not allowed"}
+        )
+    
+    # 发送请求（复用共享客户端的连接池）
+    client = _get_proxy_client()
+    try:
+        # 只有POST、PUT、PATCH请求转发请求体
+        json_body = body if method in PROXY_BODY_METHODS else None
+        upstream_request = client.build_request(method, target_url, headers=headers, params=query_params, json=json_body)
+        upstream = await client.send(upstream_request, stream=True)
+        
+        logger.info(f"Proxy response received: {upstream.status_code} from {target_url}")
+        
+        # 构建流式响应，不在内存中缓冲完整的响应内容
+        captured = bytearray()
+        response = StreamingResponse(
+            _stream_proxy_body(upstream, captured),
+            status_code=upstream.status_code,
+            headers={key: value for key, value in upstream.headers.items() if key.lower() not in _HOP_BY_HOP_HEADERS}
+        )
+        # 记录请求历史时使用的响应内容（发送过程中逐步填充）
+        response.body = captured
+        return response
+    except Exception as e:
+        logger.error(f"Proxy error: {str(e)} for {target_url}")
+        return MockJSONResponse(
+            status_code=502,
+            content={"error": f"Proxy error: {str(e)}"}
+        )
 
 
 # 辅助函数：添加路由
@@ -381,6 +660,7 @@ def add_route(route):
 def remove_route(route_id):
     """移除路由"""
     mock_router.remove_route(route_id)
+    _static_responses.pop(route_id, None)
     # 从数据库中删除路由
     db_storage.delete_route(route_id)
 
@@ -391,12 +671,135 @@ def update_route(route):
     db_storage.save_route(route)
 
 
+async def bulk_save_routes(routes):
+    """批量更新路由（内存路由表在事件循环中更新，数据库中单个事务写入并放到线程中执行）"""
+    if not routes:
+        return
+    # 路由表和索引只在事件循环线程中修改，避免与 match_route 并发
+    mock_router.update_routes(routes)
+    await asyncio.to_thread(db_storage.save_routes, routes)
+
+
 def get_all_routes():
     """获取所有路由"""
     return mock_router.get_all_routes()
 
 
-def get_request_history(limit: int = 1000, offset: int = 0, start_time: Optional[float] = None, end_time: Optional[float] = None):
+def get_route_by_id(route_id):
+    """根据ID获取路由（基于路由索引的O(1)查找）"""
+    return mock_router.get_route(route_id)
+
+
+def get_routes_version():
+    """获取路由版本号"""
+    return mock_router.version
+
+
+def get_route_search_text(route):
+    """获取路由的搜索文本（小写的名称、路径、方法和分组）"""
+    return mock_router.get_search_text(route)
+
+
+def get_routes_by_group(group):
+    """获取属于指定分组的路由"""
+    return mock_router.get_routes_by_group(group)
+
+
+def get_routes_by_tag(tag):
+    """获取带有指定标签的路由"""
+    return mock_router.get_routes_by_tag(tag)
+
+
+def mark_request_history_changed():
+    """标记请求历史已变更"""
+    global request_history_version
+    request_history_version += 1
+
+
+def get_request_history_version():
+    """获取请求历史版本号"""
+    return request_history_version
+
+
+def get_recent_requests(start_time: Optional[float] = None):
+    """获取最近的请求记录（最新的在前）
+    
+    Args:
+        start_time: 开始时间戳，早于该时间的记录将被忽略
+        
+    Returns:
+        请求记录列表
+    """
+    return [r for r in reversed(recent_requests) if start_time is None or r.timestamp >= start_time]
+
+
+def _count_request(request_record, sign: int = 1):
+    """将请求计入（sign=1）或移出（sign=-1）请求历史统计"""
+    global response_time_total
+    if request_record.response_status:
+        status_counter[request_record.response_status] += sign
+        if not status_counter[request_record.response_status]:
+            del status_counter[request_record.response_status]
+    method_counter[request_record.method] += sign
+    if not method_counter[request_record.method]:
+        del method_counter[request_record.method]
+    if request_record.response_time:
+        response_time_total += sign * request_record.response_time
+
+
+def get_request_aggregates(recent_window: float = 300):
+    """获取内存请求历史的统计信息
+    
+    Args:
+        recent_window: 统计最近请求数的时间窗口（秒）
+        
+    Returns:
+        包含总请求数、最近请求数、状态码分布、方法分布和总响应时间的字典
+    """
+    cutoff = time.time() - recent_window
+    while recent_timestamps and recent_timestamps[0] <= cutoff:
+        recent_timestamps.popleft()
+    return {
+        "total_requests": len(request_history),
+        "recent_requests": len(recent_timestamps),
+        "status_code_distribution": dict(status_counter),
+        "method_distribution": dict(method_counter),
+        "total_response_time": response_time_total,
+    }
+
+
+def reload_recent_requests():
+    """从数据库重新加载内存中的请求历史、最近请求记录和统计信息（请求历史被清理或恢复后调用）"""
+    global response_time_total
+    flush_history_writes()
+    records = db_storage.get_requests(limit=REQUEST_HISTORY_LIMIT)
+    records.reverse()
+    
+    request_history.clear()
+    request_history.extend(records)
+    request_by_id.clear()
+    request_by_id.update((record.id, record) for record in records)
+    recent_requests.clear()
+    recent_requests.extend(records[-RECENT_REQUESTS_LIMIT:])
+    
+    # 批量重建统计信息（Counter 在C层完成计数）
+    status_counter.clear()
+    status_counter.update(record.response_status for record in records if record.response_status)
+    method_counter.clear()
+    method_counter.update(record.method for record in records)
+    response_time_total = sum(record.response_time for record in records if record.response_time)
+    recent_timestamps.clear()
+    recent_timestamps.extend(sorted(record.timestamp for record in records))
+    mark_request_history_changed()
+
+# 服务启动时加载最近的请求记录
+reload_recent_requests()
+
+
+def get_request_history(limit: int = 1000, offset: int = 0, start_time: Optional[float] = None, end_time: Optional[float] = None,
+                        method: Optional[str] = None, path: Optional[str] = None, status_code: Optional[int] = None,
+                        sort: Optional[str] = None, order: Optional[str] = None,
+                        after_ts: Optional[float] = None, after_id: Optional[str] = None):
     """获取请求历史
     
     Args:
@@ -404,32 +807,62 @@ def get_request_history(limit: int = 1000, offset: int = 0, start_time: Optional
         offset: 偏移量
         start_time: 开始时间戳
         end_time: 结束时间戳
+        method: HTTP方法
+        path: 路径包含的子串
+        status_code: 响应状态码
+        sort: 排序字段
+        order: 排序方向
+        after_ts: 游标时间戳（游标分页）
+        after_id: 游标请求ID（游标分页）
         
     Returns:
         请求历史列表
     """
-    # 从数据库中获取请求历史，传入时间范围过滤
-    return db_storage.get_requests(limit=limit, offset=offset, start_time=start_time, end_time=end_time)
+    # 从数据库中获取请求历史，过滤、排序和分页均由SQL完成
+    flush_history_writes()
+    return db_storage.get_requests(limit=limit, offset=offset, start_time=start_time, end_time=end_time,
+                                   method=method, path=path, status_code=status_code, sort=sort, order=order,
+                                   after_ts=after_ts, after_id=after_id)
 
-def get_request_history_count(start_time: Optional[float] = None, end_time: Optional[float] = None) -> int:
+def get_request_history_count(start_time: Optional[float] = None, end_time: Optional[float] = None,
+                              method: Optional[str] = None, path: Optional[str] = None,
+                              status_code: Optional[int] = None) -> int:
     """获取请求历史总数
     
     Args:
         start_time: 开始时间戳
         end_time: 结束时间戳
+        method: HTTP方法
+        path: 路径包含的子串
+        status_code: 响应状态码
         
     Returns:
         请求历史总数
     """
-    # 从数据库中获取请求历史总数，传入时间范围过滤
-    return db_storage.get_requests_count(start_time=start_time, end_time=end_time)
+    # 从数据库中获取请求历史总数，过滤条件由SQL完成
+    flush_history_writes()
+    return db_storage.get_requests_count(start_time=start_time, end_time=end_time,
+                                         method=method, path=path, status_code=status_code)
 
 
 def get_response_history():
-    """获取响应历史"""
-    return response_history
+    """获取响应历史（返回列表副本）"""
+    return list(response_history)
+
+
+def clear_history():
+    """清空内存中的请求和响应历史"""
+    global response_time_total
+    request_history.clear()
+    response_history.clear()
+    request_by_id.clear()
+    response_by_request_id.clear()
+    status_counter.clear()
+    method_counter.clear()
+    response_time_total = 0.0
+    recent_timestamps.clear()
 
 
 def get_server_uptime():
     """获取服务器运行时间"""
-    return time.time() - server_start_time
+    return time.monotonic() - server_start_monotonic
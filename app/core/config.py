@@ -1,8 +1,14 @@
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Mapping
 from pydantic_settings import BaseSettings
 from pydantic import Field
+import hashlib
+import json
 import os
-import yaml
+
+
+# 默认配置文件路径
+DEFAULT_CONFIG_PATH = "config/default.yaml"
 
 
 class ServerConfig(BaseSettings):
@@ -12,6 +18,7 @@ class ServerConfig(BaseSettings):
     enable_https: bool = Field(default=False, description="是否启用HTTPS")
     https_cert: Optional[str] = Field(default=None, description="HTTPS证书路径")
     https_key: Optional[str] = Field(default=None, description="HTTPS私钥路径")
+    debug: bool = Field(default=False, description="是否启用调试模式（模板自动重载等）")
     
     class Config:
         env_prefix = "SERVER_"
@@ -31,8 +38,9 @@ class AdminConfig(BaseSettings):
 class StorageConfig(BaseSettings):
     """存储配置"""
     enable_persistence: bool = Field(default=True, description="是否启用配置持久化")
-    config_file: str = Field(default="config/default.yaml", description="配置文件路径")
+    config_file: str = Field(default=DEFAULT_CONFIG_PATH, description="配置文件路径")
     db_path: str = Field(default="data/mock_server.db", description="数据库文件路径")
+    history_size: int = Field(default=1000, description="内存中保留的请求历史条数")
     
     class Config:
         env_prefix = "STORAGE_"
@@ -56,111 +64,134 @@ class LogConfig(BaseSettings):
         env_prefix = "LOG_"
 
 
+# YAML解析结果缓存文件的后缀（与配置文件放在同一目录）
+YAML_CACHE_SUFFIX = '.cache.json'
+
+
+def _read_yaml_cache(cache_file: str, digest: str) -> Optional[Dict[str, Any]]:
+    """读取YAML解析结果缓存，配置文件内容摘要与缓存记录不一致时返回None"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('digest') != digest:
+        return None
+    return cached.get('config')
+
+
+def _write_yaml_cache(cache_file: str, digest: str, data: Dict[str, Any]) -> None:
+    """写入YAML解析结果缓存（内容无法用JSON原样表示或目录不可写时跳过）"""
+    try:
+        content = json.dumps({'digest': digest, 'config': data}, ensure_ascii=False)
+        # 非字符串的键、元组等会在JSON中改变类型，此时不缓存
+        if json.loads(content)['config'] != data:
+            return
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
 def load_yaml_config(config_file: str) -> Dict[str, Any]:
     """加载YAML配置文件
     
+    解析结果以JSON格式缓存在配置文件旁边，并记录配置文件内容的摘要。配置文件内容未变化时直接读取缓存，
+    无需重新解析YAML（按内容而不是修改时间判断，同一时间粒度内的等长改写也能识别）。
+    
     Args:
         config_file: 配置文件路径
         
     Returns:
         配置字典
     """
-    if not os.path.exists(config_file):
+    try:
+        with open(config_file, 'rb') as f:
+            raw = f.read()
+    except OSError:
         return {}
     
+    # 计算摘要远比解析YAML便宜
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    cache_file = config_file + YAML_CACHE_SUFFIX
+    cached = _read_yaml_cache(cache_file, digest)
+    if cached is not None:
+        return cached
+    
+    # 只有缓存未命中时才需要解析YAML，此时再导入PyYAML
+    import yaml
+    
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f) or {}
+        # 优先使用libyaml提供的C解析器
+        data = yaml.load(raw.decode('utf-8'), Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) or {}
     except Exception as e:
         print(f"加载配置文件失败: {e}")
         return {}
+    
+    _write_yaml_cache(cache_file, digest, data)
+    return data
 
 
 class AppConfig(BaseSettings):
     """应用全局配置"""
-    server: ServerConfig = ServerConfig()
-    admin: AdminConfig = AdminConfig()
-    storage: StorageConfig = StorageConfig()
-    proxy: ProxyConfig = ProxyConfig()
-    log: LogConfig = LogConfig()
+    server: ServerConfig = Field(default_factory=ServerConfig)
+    admin: AdminConfig = Field(default_factory=AdminConfig)
+    storage: StorageConfig = Field(default_factory=StorageConfig)
+    proxy: ProxyConfig = Field(default_factory=ProxyConfig)
+    log: LogConfig = Field(default_factory=LogConfig)
     
     class Config:
         env_nested_delimiter = "__"
         case_sensitive = False
 
 
-# 首先加载YAML配置文件，获取默认的配置文件路径
-temp_storage = StorageConfig()
-config_file_path = temp_storage.config_file
-
-# 加载YAML配置文件
-yaml_config = load_yaml_config(config_file_path)
-
-# 从YAML配置中提取各部分配置
-server_from_yaml = yaml_config.get('server', {})
-admin_from_yaml = yaml_config.get('admin', {})
-storage_from_yaml = yaml_config.get('storage', {})
-proxy_from_yaml = yaml_config.get('proxy', {})
-log_from_yaml = yaml_config.get('log', {})
-
-# 创建各个子配置类的实例，让它们从环境变量中获取值
-# 注意：我们不传递任何参数，让Pydantic自己处理环境变量和默认值
-server_config = ServerConfig()
-admin_config = AdminConfig()
-storage_config = StorageConfig()
-proxy_config = ProxyConfig()
-log_config = LogConfig()
-
-# 检查环境变量是否设置了值，如果没有，就使用YAML配置中的值
-# 这样可以确保环境变量的优先级高于YAML配置
-
-# 服务器配置
-if not os.getenv('SERVER_HOST') and 'host' in server_from_yaml:
-    server_config.host = server_from_yaml['host']
-if not os.getenv('SERVER_PORT') and 'port' in server_from_yaml:
-    server_config.port = server_from_yaml['port']
-if not os.getenv('SERVER_ENABLE_HTTPS') and 'enable_https' in server_from_yaml:
-    server_config.enable_https = server_from_yaml['enable_https']
-if not os.getenv('SERVER_HTTPS_CERT') and 'https_cert' in server_from_yaml:
-    server_config.https_cert = server_from_yaml['https_cert']
-if not os.getenv('SERVER_HTTPS_KEY') and 'https_key' in server_from_yaml:
-    server_config.https_key = server_from_yaml['https_key']
-
-# 管理界面配置
-if not os.getenv('ADMIN_ENABLE') and 'enable' in admin_from_yaml:
-    admin_config.enable = admin_from_yaml['enable']
-if not os.getenv('ADMIN_USERNAME') and 'username' in admin_from_yaml:
-    admin_config.username = admin_from_yaml['username']
-if not os.getenv('ADMIN_PASSWORD') and 'password' in admin_from_yaml:
-    admin_config.password = admin_from_yaml['password']
-if not os.getenv('ADMIN_ENABLE_API') and 'enable_api' in admin_from_yaml:
-    admin_config.enable_api = admin_from_yaml['enable_api']
-
-# 存储配置
-if not os.getenv('STORAGE_ENABLE_PERSISTENCE') and 'enable_persistence' in storage_from_yaml:
-    storage_config.enable_persistence = storage_from_yaml['enable_persistence']
-if not os.getenv('STORAGE_CONFIG_FILE') and 'config_file' in storage_from_yaml:
-    storage_config.config_file = storage_from_yaml['config_file']
-if not os.getenv('STORAGE_DB_PATH') and 'db_path' in storage_from_yaml:
-    storage_config.db_path = storage_from_yaml['db_path']
-
-# 代理配置
-if not os.getenv('PROXY_ENABLE') and 'enable' in proxy_from_yaml:
-    proxy_config.enable = proxy_from_yaml['enable']
-if not os.getenv('PROXY_TARGET_URL') and 'target_url' in proxy_from_yaml:
-    proxy_config.target_url = proxy_from_yaml['target_url']
-
-# 日志配置
-if not os.getenv('LOG_LEVEL') and 'level' in log_from_yaml:
-    log_config.level = log_from_yaml['level']
-if not os.getenv('LOG_FILE') and 'file' in log_from_yaml:
-    log_config.file = log_from_yaml['file']
-
-# 创建最终的配置实例
-config = AppConfig(
-    server=server_config,
-    admin=admin_config,
-    storage=storage_config,
-    proxy=proxy_config,
-    log=log_config
-)
+def build_section_config(config_class, section_yaml: Optional[Dict[str, Any]],
+                         env: Optional[Mapping[str, str]] = None):
+    """创建一部分配置的实例
+    
+    环境变量未设置的字段使用YAML配置中的值，其余字段由Pydantic从环境变量和默认值获取，
+    环境变量名为配置类的env_prefix加大写的字段名，因此环境变量的优先级高于YAML配置。
+    所有值在创建实例时统一经过Pydantic校验。
+    
+    Args:
+        config_class: 配置类
+        section_yaml: YAML配置中对应的部分
+        env: 环境变量快照，默认使用os.environ
+        
+    Returns:
+        配置实例
+    """
+    if env is None:
+        env = os.environ
+    section_yaml = section_yaml or {}
+    env_prefix = config_class.model_config.get('env_prefix', '')
+    values = {
+        field: section_yaml[field]
+        for field in config_class.model_fields
+        if field in section_yaml and not env.get(env_prefix + field.upper())
+    }
+    return config_class(**values)
+
+
+@lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    """加载应用配置（加载YAML配置文件并合并环境变量，只加载一次，之后返回同一实例）"""
+    # 环境变量快照（只读取一次）
+    env = dict(os.environ)
+    
+    # 加载YAML配置文件（路径可通过STORAGE_CONFIG_FILE环境变量指定）
+    config_file_path = env.get('STORAGE_CONFIG_FILE') or DEFAULT_CONFIG_PATH
+    yaml_config = load_yaml_config(config_file_path)
+    
+    # 创建最终的配置实例
+    return AppConfig(
+        server=build_section_config(ServerConfig, yaml_config.get('server'), env),
+        admin=build_section_config(AdminConfig, yaml_config.get('admin'), env),
+        storage=build_section_config(StorageConfig, yaml_config.get('storage'), env),
+        proxy=build_section_config(ProxyConfig, yaml_config.get('proxy'), env),
+        log=build_section_config(LogConfig, yaml_config.get('log'), env)
+    )
+
+
+# 全局配置实例（各模块在导入时即使用，因此在模块加载时创建）
+config = get_config()
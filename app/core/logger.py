@@ -10,7 +10,10 @@ class Logger:
     def __init__(self):
         """初始化日志配置"""
         self.logger = logging.getLogger('mock_server')
-        self.logger.setLevel(self._get_log_level(config.log.level))
+        # 日志级别只解析一次，未知级别回退到INFO
+        level = logging.getLevelName(config.log.level.upper())
+        level = level if isinstance(level, int) else logging.INFO
+        self.logger.setLevel(level)
         
         # 清除已有的处理器
         for handler in self.logger.handlers[:]:
@@ -18,7 +21,7 @@ class Logger:
         
         # 创建控制台处理器
         console_handler = logging.StreamHandler()
-        console_handler.setLevel(self._get_log_level(config.log.level))
+        console_handler.setLevel(level)
         
         # 创建文件处理器（如果配置了日志文件）
         file_handler = None
@@ -36,7 +39,7 @@ class Logger:
                 backupCount=5,  # 最多保留 5 个备份
                 encoding='utf-8'
             )
-            file_handler.setLevel(self._get_log_level(config.log.level))
+            file_handler.setLevel(level)
         
         # 定义日志格式
         formatter = logging.Formatter(
@@ -53,24 +56,6 @@ class Logger:
         if file_handler:
             self.logger.addHandler(file_handler)
     
-    def _get_log_level(self, level_str: str) -> int:
-        """将字符串日志级别转换为整数
-        
-        Args:
-            level_str: 日志级别字符串 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-            
-        Returns:
-            对应的日志级别整数
-        """
-        level_map = {
-            'DEBUG': logging.DEBUG,
-            'INFO': logging.INFO,
-            'WARNING': logging.WARNING,
-            'ERROR': logging.ERROR,
-            'CRITICAL': logging.CRITICAL
-        }
-        return level_map.get(level_str.upper(), logging.INFO)
-    
     def get_logger(self) -> logging.Logger:
         """获取日志记录器实例
         
@@ -1,3 +1,6 @@
+import hashlib
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
@@ -24,79 +27,34 @@ app.add_middleware(
 )
 
 # 添加根路径处理
-from fastapi.responses import HTMLResponse
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+
+# 首页内容在导入时读取一次，以字节形式常驻内存，避免每次请求的文件IO与编码
+with open("app/static/index.html", "rb") as _f:
+    _ROOT_HTML_BYTES = _f.read()
+_ROOT_HTML_ETAG = '"%s"' % hashlib.blake2b(_ROOT_HTML_BYTES, digest_size=8).hexdigest()
 
 @app.get("/", response_class=HTMLResponse)
-async def root():
-    """根路径"""
-    return """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Mock Server</title>
-        <style>
-            body {
-                font-family: Arial, sans-serif;
-                max-width: 800px;
-                margin: 0 auto;
-                padding: 20px;
-                text-align: center;
-            }
-            h1 {
-                color: #333;
-            }
-            .links {
-                margin-top: 30px;
-            }
-            .link-item {
-                display: inline-block;
-                margin: 10px;
-                padding: 12px 24px;
-                border-radius: 8px;
-                text-decoration: none;
-                color: white;
-                font-weight: bold;
-                transition: all 0.3s ease;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }
-            .link-item:nth-child(1) {
-                background-color: #4a90e2;
-            }
-            .link-item:nth-child(2) {
-                background-color: #50e3c2;
-            }
-            .link-item:nth-child(3) {
-                background-color: #9013fe;
-            }
-            .link-item:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 4px 8px rgba(0,0,0,0.15);
-                opacity: 0.9;
-            }
-        </style>
-    </head>
-    <body>
-        <h1>Mock Server</h1>
-        <p>企业级 Python Mock Server</p>
-        <div class="links">
-            <a href="/admin" class="link-item">管理界面</a>
-            <a href="/health" class="link-item">健康检查</a>
-            <a href="/docs" class="link-item">API文档</a>
-        </div>
-    </body>
-    </html>
-    """
+async def root(request: Request):
+    """根路径（首页为预先读取的字节常量，支持ETag条件请求）"""
+    if request.headers.get("if-none-match") == _ROOT_HTML_ETAG:
+        return Response(status_code=304, headers={"ETag": _ROOT_HTML_ETAG})
+    return HTMLResponse(content=_ROOT_HTML_BYTES, headers={"ETag": _ROOT_HTML_ETAG})
 
 # 添加favicon.ico路由
-@app.get("/favicon.ico")
-async def favicon():
-    """返回favicon图标"""
-    # 使用内置的favicon图标（从htmlcov目录复制一个）
-    try:
-        return FileResponse("htmlcov/favicon_32_cb_c827f16f.png")
-    except:
-        # 如果文件不存在，返回一个空的204响应
-        from fastapi.responses import Response
+# 使用内置的favicon图标（从htmlcov目录复制一个），文件是否存在只在启动时检查一次
+_FAVICON_PATH = "htmlcov/favicon_32_cb_c827f16f.png"
+
+if os.path.isfile(_FAVICON_PATH):
+    @app.get("/favicon.ico")
+    async def favicon():
+        """返回favicon图标"""
+        return FileResponse(_FAVICON_PATH)
+else:
+    @app.get("/favicon.ico")
+    async def favicon():
+        """favicon文件不存在，返回一个空的204响应"""
         return Response(status_code=204)
 
 # 注册路由
@@ -112,6 +70,9 @@ if config.admin.enable_api:
 # 注册Mock API路由（通配符路由放在最后）
 app.include_router(mock.router, tags=["mock"])
 
+# 服务关闭时释放代理转发客户端的连接池
+app.add_event_handler("shutdown", mock.close_proxy_client)
+
 
 def create_app() -> FastAPI:
     """创建FastAPI应用实例"""
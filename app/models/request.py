@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Dict, Optional, Any
 from pydantic import BaseModel, Field
 
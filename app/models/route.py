@@ -29,6 +29,7 @@ class RouteResponse(BaseModel):
     simulate_error: bool = Field(default=False, description="是否模拟错误")
     error_type: Optional[str] = Field(default=None, description="错误类型：timeout, network_error, server_error")
     error_probability: float = Field(default=1.0, description="错误发生概率（0-1）")
+    timeout_duration: float = Field(default=30.0, description="模拟超时的等待时间（秒），为0时立即返回408")
     # 认证测试字段
     auth_scenario: Optional[str] = Field(default=None, description="认证场景：valid, expired, invalid")
     auth_token: Optional[str] = Field(default=None, description="认证令牌")
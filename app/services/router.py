@@ -1,34 +1,161 @@
 import re
-from typing import Dict, List, Optional, Tuple, Any
+from operator import itemgetter
+from typing import Dict, List, Optional, Set, Tuple, Any
 from app.models.route import Route, RouteMatchRule
 
 
+class _RouteNode:
+    """路由前缀树节点（按路径段逐级匹配）"""
+    
+    __slots__ = ("static", "param", "routes")
+    
+    def __init__(self):
+        # 固定路径段 -> 子节点
+        self.static: Dict[str, "_RouteNode"] = {}
+        # 路径参数段（{name}）的子节点
+        self.param: Optional["_RouteNode"] = None
+        # 在此节点结束的路由：(优先级序号, 路由, 路径参数位置和名称)
+        self.routes: List[Tuple[int, Route, Tuple[Tuple[int, str], ...]]] = []
+
+
 class Router:
     """路由匹配服务"""
     
     def __init__(self):
         self.routes: Dict[str, Route] = {}
+        # 路由版本号，每次路由变更时递增，用于缓存失效判断
+        self.version: int = 0
+        # 路由快照（不可变元组），路由变更时失效，按需重建
+        self._snapshot: Optional[Tuple[Route, ...]] = None
+        # 路由搜索索引：路由ID -> 小写的名称、路径、方法和分组
+        self._search_index: Dict[str, str] = {}
+        # 分组/标签反向索引：名称 -> 路由ID集合
+        self._group_index: Dict[str, Set[str]] = {}
+        self._tag_index: Dict[str, Set[str]] = {}
+        # 建立索引时记录的路由分组和标签，路由被原地修改后仍能找到旧的索引项
+        self._indexed_labels: Dict[str, Tuple[Optional[str], Tuple[str, ...]]] = {}
+        # 路由匹配结构（路由变更时失效，下次匹配时重建）：
+        # HTTP方法 -> (路径前缀树根节点, 正则和通配符路由列表)，以及构建时的路由数量
+        self._matcher: Optional[Dict[str, Tuple[_RouteNode, List[Tuple[int, Route]]]]] = None
+        self._matcher_size: int = 0
+    
+    def _mark_changed(self) -> None:
+        """标记路由已变更"""
+        self.version += 1
+        self._snapshot = None
+        self._matcher = None
+    
+    def _unindex_labels(self, route_id: str) -> None:
+        """从分组/标签反向索引中移除路由"""
+        labels = self._indexed_labels.pop(route_id, None)
+        if labels is None:
+            return
+        group, tags = labels
+        if group is not None:
+            self._discard_from_index(self._group_index, group, route_id)
+        for tag in tags:
+            self._discard_from_index(self._tag_index, tag, route_id)
+    
+    @staticmethod
+    def _discard_from_index(index: Dict[str, Set[str]], name: str, route_id: str) -> None:
+        """从反向索引的某个名称下移除路由ID，集合为空时删除该名称"""
+        route_ids = index.get(name)
+        if route_ids is not None:
+            route_ids.discard(route_id)
+            if not route_ids:
+                del index[name]
+    
+    def _index_labels(self, route: Route) -> None:
+        """将路由加入分组/标签反向索引"""
+        self._unindex_labels(route.id)
+        tags = tuple(route.tags) if route.tags else ()
+        self._indexed_labels[route.id] = (route.group or None, tags)
+        if route.group:
+            self._group_index.setdefault(route.group, set()).add(route.id)
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(route.id)
     
     def add_route(self, route: Route) -> None:
         """添加路由"""
         self.routes[route.id] = route
+        self._search_index.pop(route.id, None)
+        self._index_labels(route)
+        self._mark_changed()
     
     def remove_route(self, route_id: str) -> None:
         """移除路由"""
         if route_id in self.routes:
             del self.routes[route_id]
+            self._search_index.pop(route_id, None)
+            self._unindex_labels(route_id)
+            self._mark_changed()
     
     def update_route(self, route: Route) -> None:
         """更新路由"""
         self.routes[route.id] = route
+        self._search_index.pop(route.id, None)
+        self._index_labels(route)
+        self._mark_changed()
+    
+    def update_routes(self, routes: List[Route]) -> None:
+        """批量更新路由"""
+        for route in routes:
+            self.routes[route.id] = route
+            self._search_index.pop(route.id, None)
+            self._index_labels(route)
+        self._mark_changed()
+    
+    def clear(self) -> None:
+        """清除所有路由"""
+        self.routes.clear()
+        self._search_index.clear()
+        self._group_index.clear()
+        self._tag_index.clear()
+        self._indexed_labels.clear()
+        self._mark_changed()
+    
+    def get_routes_by_group(self, group: str) -> List[Route]:
+        """获取属于指定分组的路由（基于反向索引，无需遍历所有路由）"""
+        routes = []
+        for route_id in self._group_index.get(group, ()):
+            route = self.routes.get(route_id)
+            if route is not None and route.group == group:
+                routes.append(route)
+        return routes
+    
+    def get_routes_by_tag(self, tag: str) -> List[Route]:
+        """获取带有指定标签的路由（基于反向索引，无需遍历所有路由）"""
+        routes = []
+        for route_id in self._tag_index.get(tag, ()):
+            route = self.routes.get(route_id)
+            if route is not None and route.tags and tag in route.tags:
+                routes.append(route)
+        return routes
+    
+    def get_search_text(self, route: Route) -> str:
+        """获取路由的搜索文本（小写的名称、路径、方法和分组，按行分隔），首次使用时计算并缓存"""
+        text = self._search_index.get(route.id)
+        if text is None:
+            match_rule = route.match_rule
+            text = "\n".join((
+                route.name or "",
+                (match_rule.path or "") if match_rule else "",
+                ", ".join(match_rule.methods) if match_rule and match_rule.methods else "",
+                route.group or "",
+            )).lower()
+            self._search_index[route.id] = text
+        return text
     
     def get_route(self, route_id: str) -> Optional[Route]:
         """获取路由"""
         return self.routes.get(route_id)
     
-    def get_all_routes(self) -> List[Route]:
-        """获取所有路由"""
-        return list(self.routes.values())
+    def get_all_routes(self) -> Tuple[Route, ...]:
+        """获取所有路由（只读快照，调用方不应修改）"""
+        # 长度校验用于兜底直接修改routes字典（如清空）的情况
+        if self._snapshot is None or len(self._snapshot) != len(self.routes):
+            self._snapshot = tuple(self.routes.values())
+        return self._snapshot
     
     def match_route(self, method: str, path: str, headers: Dict[str, str], 
                     query_params: Dict[str, Any], body: Optional[Any] = None) -> Optional[Tuple[Route, Dict[str, Any]]]:
@@ -44,21 +171,31 @@ class Router:
         Returns:
             匹配的路由和提取的路径参数，若未匹配则返回None
         """
-        # 按优先级排序路由（更具体的路由优先）
-        sorted_routes = sorted(
-            [r for r in self.routes.values() if r.enabled],
-            key=lambda x: (-self._route_specificity(x.match_rule), x.id)
-        )
+        # 长度校验用于兜底直接修改routes字典（如清空）的情况
+        if self._matcher is None or self._matcher_size != len(self.routes):
+            self._build_matcher()
+        entry = self._matcher.get(method)
+        if entry is None:
+            return None
+        root, fallback_routes = entry
         
-        for route in sorted_routes:
-            # 检查HTTP方法是否匹配
-            if method not in route.match_rule.methods:
-                continue
+        # 通过前缀树找出路径可能匹配的路由，再按优先级依次检查其余匹配条件
+        request_parts = path.strip('/').split('/')
+        candidates = []
+        self._collect_candidates(root, request_parts, 0, candidates)
+        candidates.extend(fallback_routes)
+        candidates.sort(key=itemgetter(0))
+        
+        for candidate in candidates:
+            route = candidate[1]
             
             # 匹配路径
-            path_params = self._match_path(path, route.match_rule.path, route.match_rule.use_regex)
-            if path_params is None:
-                continue
+            if len(candidate) == 3:
+                path_params = {name: request_parts[index] for index, name in candidate[2]}
+            else:
+                path_params = self._match_path(path, route.match_rule.path, route.match_rule.use_regex)
+                if path_params is None:
+                    continue
             
             # 匹配头部
             if not self._match_headers(headers, route.match_rule.headers):
@@ -76,6 +213,55 @@ class Router:
         
         return None
     
+    def _build_matcher(self) -> None:
+        """构建路由匹配结构：按HTTP方法划分，普通路由按路径段建立前缀树，正则和通配符路由单独列出"""
+        # 按优先级排序路由（更具体的路由优先），序号即匹配顺序
+        sorted_routes = sorted(
+            [r for r in self.routes.values() if r.enabled],
+            key=lambda x: (-self._route_specificity(x.match_rule), x.id)
+        )
+        
+        matcher = {}
+        for rank, route in enumerate(sorted_routes):
+            match_rule = route.match_rule
+            route_parts = match_rule.path.strip('/').split('/')
+            for method in set(match_rule.methods):
+                entry = matcher.get(method)
+                if entry is None:
+                    entry = matcher[method] = (_RouteNode(), [])
+                if match_rule.use_regex or '*' in route_parts:
+                    entry[1].append((rank, route))
+                    continue
+                
+                node = entry[0]
+                params = []
+                for index, part in enumerate(route_parts):
+                    if part.startswith('{') and part.endswith('}'):
+                        params.append((index, part[1:-1]))
+                        if node.param is None:
+                            node.param = _RouteNode()
+                        node = node.param
+                    else:
+                        child = node.static.get(part)
+                        if child is None:
+                            child = node.static[part] = _RouteNode()
+                        node = child
+                node.routes.append((rank, route, tuple(params)))
+        
+        self._matcher = matcher
+        self._matcher_size = len(self.routes)
+    
+    def _collect_candidates(self, node: _RouteNode, parts: List[str], index: int, candidates: list) -> None:
+        """沿前缀树收集路径匹配的路由（固定路径段和路径参数段的分支都会尝试）"""
+        if index == len(parts):
+            candidates.extend(node.routes)
+            return
+        child = node.static.get(parts[index])
+        if child is not None:
+            self._collect_candidates(child, parts, index + 1, candidates)
+        if node.param is not None:
+            self._collect_candidates(node.param, parts, index + 1, candidates)
+    
     def _route_specificity(self, match_rule: RouteMatchRule) -> int:
         """计算路由的特异性得分（用于排序）"""
         score = 0
@@ -1,4 +1,6 @@
 import random
+import re
+import string
 import time
 from typing import Dict, Any, Optional
 import json
@@ -7,6 +9,13 @@ import json
 class Templater:
     """响应模板服务"""
     
+    # 模板变量统计缓存的最大条目数
+    STATIC_CACHE_MAX_ENTRIES = 1024
+    
+    def __init__(self):
+        # id(内容) -> (内容, 含模板变量的字符串数量)；保留内容引用，避免对象回收后id被复用
+        self._static_cache = {}
+    
     def render_response(self, content: Any, context: Dict[str, Any] = None) -> Any:
         """渲染响应内容
         
@@ -20,9 +29,40 @@ class Templater:
         if context is None:
             context = {}
         
+        # 不含模板变量的内容渲染结果与原内容相同，直接返回
+        if self.is_static(content):
+            return content
+        
         # 递归处理响应内容
         return self._render_value(content, context)
     
+    def is_static(self, content: Any) -> bool:
+        """判断响应内容是否不含任何模板变量"""
+        return self.template_count(content) == 0
+    
+    def template_count(self, content: Any) -> int:
+        """统计响应内容中含模板变量的字符串数量，用于估算渲染开销（按内容对象缓存统计结果）"""
+        cached = self._static_cache.get(id(content))
+        if cached is not None and cached[0] is content:
+            return cached[1]
+        
+        count = self._count_placeholders(content)
+        if len(self._static_cache) >= self.STATIC_CACHE_MAX_ENTRIES:
+            self._static_cache.clear()
+        self._static_cache[id(content)] = (content, count)
+        return count
+    
+    def _count_placeholders(self, value: Any) -> int:
+        """递归统计值中含模板变量的字符串数量"""
+        if isinstance(value, str):
+            return 1 if '{{' in value else 0
+        elif isinstance(value, dict):
+            return sum(self._count_placeholders(v) for v in value.values())
+        elif isinstance(value, list):
+            return sum(self._count_placeholders(item) for item in value)
+        else:
+            return 0
+    
     def _render_value(self, value: Any, context: Dict[str, Any]) -> Any:
         """递归渲染值"""
         if isinstance(value, str):
@@ -49,7 +89,6 @@ class Templater:
         result = template
         
         # 替换复杂变量（支持嵌套访问，如request.headers.user-agent）
-        import re
         # 匹配模板变量模式：{{namespace.key1.key2...}}
         pattern = r'\{\{(\w+\.(?:[\w-]+\.)*[\w-]+)\}\}'
         matches = re.findall(pattern, result)
@@ -136,7 +175,6 @@ class Templater:
     
     def _generate_random_string(self, length: int = 8) -> str:
         """生成随机字符串"""
-        import string
         return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
     
     def generate_random_data(self, data_type: str, **kwargs) -> Any:
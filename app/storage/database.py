@@ -123,6 +123,13 @@ class DatabaseStorage:
             except Exception as e:
                 print(f"添加字段失败: {e}")
             
+            # 创建请求表索引，支持按时间范围及方法/状态码过滤
+            # (timestamp, id) 复合索引同时支持时间范围过滤和游标分页，取代旧的单列时间戳索引
+            cursor.execute('DROP INDEX IF EXISTS idx_requests_timestamp')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_requests_timestamp_id ON requests (timestamp, id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_requests_method_status_ts ON requests (method, response_status, timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_requests_path ON requests (path)')
+            
             # 创建配置表
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS configs (
@@ -138,6 +145,48 @@ class DatabaseStorage:
         finally:
             self._close_connection(conn)
     
+    _SAVE_REQUEST_SQL = '''
+                INSERT OR REPLACE INTO requests 
+                (id, timestamp, method, path, query_params, headers, body, client_ip, matched_route_id, response_status, response_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                '''
+    
+    _SAVE_RESPONSE_SQL = '''
+                INSERT OR REPLACE INTO responses 
+                (id, request_id, timestamp, status_code, headers, content, content_type, response_time, delay_applied)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                '''
+    
+    def _request_to_row(self, request: RequestModel) -> tuple:
+        """将请求记录转换为数据库行（与_SAVE_REQUEST_SQL的字段顺序一致）"""
+        return (
+            request.id,
+            request.timestamp,
+            request.method,
+            request.path,
+            json.dumps(request.query_params),
+            json.dumps(request.headers),
+            json.dumps(request.body),
+            request.client_ip,
+            request.matched_route_id,
+            request.response_status,
+            request.response_time
+        )
+    
+    def _response_to_row(self, response: ResponseModel) -> tuple:
+        """将响应记录转换为数据库行（与_SAVE_RESPONSE_SQL的字段顺序一致）"""
+        return (
+            response.id,
+            response.request_id,
+            response.timestamp,
+            response.status_code,
+            json.dumps(response.headers),
+            json.dumps(response.content),
+            response.content_type,
+            response.response_time,
+            response.delay_applied
+        )
+    
     def save_request(self, request: RequestModel):
         """保存请求记录
         
@@ -148,26 +197,7 @@ class DatabaseStorage:
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
-            cursor.execute(
-                '''
-                INSERT OR REPLACE INTO requests 
-                (id, timestamp, method, path, query_params, headers, body, client_ip, matched_route_id, response_status, response_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''',
-                (
-                    request.id,
-                    request.timestamp,
-                    request.method,
-                    request.path,
-                    json.dumps(request.query_params),
-                    json.dumps(request.headers),
-                    json.dumps(request.body),
-                    request.client_ip,
-                    request.matched_route_id,
-                    request.response_status,
-                    request.response_time
-                )
-            )
+            cursor.execute(self._SAVE_REQUEST_SQL, self._request_to_row(request))
             conn.commit()
         finally:
             self._close_connection(conn)
@@ -182,34 +212,81 @@ class DatabaseStorage:
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
-            cursor.execute(
-                '''
-                INSERT OR REPLACE INTO responses 
-                (id, request_id, timestamp, status_code, headers, content, content_type, response_time, delay_applied)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''',
-                (
-                    response.id,
-                    response.request_id,
-                    response.timestamp,
-                    response.status_code,
-                    json.dumps(response.headers),
-                    json.dumps(response.content),
-                    response.content_type,
-                    response.response_time,
-                    response.delay_applied
-                )
-            )
+            cursor.execute(self._SAVE_RESPONSE_SQL, self._response_to_row(response))
             conn.commit()
         finally:
             self._close_connection(conn)
     
-    def get_requests_count(self, start_time: Optional[float] = None, end_time: Optional[float] = None) -> int:
+    def save_history(self, requests: List[RequestModel], responses: List[ResponseModel]):
+        """批量保存请求和响应记录（单个事务）
+        
+        Args:
+            requests: 请求模型实例列表
+            responses: 响应模型实例列表
+        """
+        if not requests and not responses:
+            return
+        conn = None
+        try:
+            conn = self._get_connection()
+            with conn:
+                if requests:
+                    conn.executemany(self._SAVE_REQUEST_SQL, [self._request_to_row(request) for request in requests])
+                if responses:
+                    conn.executemany(self._SAVE_RESPONSE_SQL, [self._response_to_row(response) for response in responses])
+        finally:
+            self._close_connection(conn)
+    
+    def _build_request_filters(self, start_time: Optional[float] = None, end_time: Optional[float] = None,
+                               method: Optional[str] = None, path: Optional[str] = None,
+                               status_code: Optional[int] = None):
+        """构建请求记录查询的WHERE子句
+        
+        Args:
+            start_time: 开始时间戳
+            end_time: 结束时间戳
+            method: HTTP方法
+            path: 路径包含的子串
+            status_code: 响应状态码
+            
+        Returns:
+            (WHERE子句, 参数列表)
+        """
+        conditions = []
+        params = []
+        
+        if method:
+            conditions.append('method = ?')
+            params.append(method)
+        if status_code:
+            conditions.append('response_status = ?')
+            params.append(status_code)
+        if start_time is not None:
+            conditions.append('timestamp >= ?')
+            params.append(start_time)
+        if end_time is not None:
+            conditions.append('timestamp <= ?')
+            params.append(end_time)
+        if path:
+            # instr区分大小写，与原先Python中的子串匹配语义一致
+            conditions.append('instr(path, ?) > 0')
+            params.append(path)
+        
+        if not conditions:
+            return '', params
+        return 'WHERE ' + ' AND '.join(conditions) + ' ', params
+    
+    def get_requests_count(self, start_time: Optional[float] = None, end_time: Optional[float] = None,
+                           method: Optional[str] = None, path: Optional[str] = None,
+                           status_code: Optional[int] = None) -> int:
         """获取请求记录总数
         
         Args:
             start_time: 开始时间戳
             end_time: 结束时间戳
+            method: HTTP方法
+            path: 路径包含的子串
+            status_code: 响应状态码
             
         Returns:
             请求记录总数
@@ -220,20 +297,8 @@ class DatabaseStorage:
             cursor = conn.cursor()
             
             # 构建查询语句
-            query = 'SELECT COUNT(*) FROM requests '
-            params = []
-            
-            # 添加时间范围过滤
-            if start_time is not None or end_time is not None:
-                query += 'WHERE '
-                if start_time is not None:
-                    query += 'timestamp >= ? '
-                    params.append(start_time)
-                if start_time is not None and end_time is not None:
-                    query += 'AND '
-                if end_time is not None:
-                    query += 'timestamp <= ? '
-                    params.append(end_time)
+            where, params = self._build_request_filters(start_time, end_time, method, path, status_code)
+            query = 'SELECT COUNT(*) FROM requests ' + where
             
             cursor.execute(query, params)
             count = cursor.fetchone()[0]
@@ -244,7 +309,14 @@ class DatabaseStorage:
         finally:
             self._close_connection(conn)
     
-    def get_requests(self, limit: int = 1000, offset: int = 0, start_time: Optional[float] = None, end_time: Optional[float] = None) -> List[RequestModel]:
+    # 请求记录允许排序的字段
+    _REQUEST_SORT_COLUMNS = frozenset(['timestamp', 'method', 'path', 'response_status', 'response_time', 'client_ip'])
+    
+    def get_requests(self, limit: int = 1000, offset: int = 0, start_time: Optional[float] = None, end_time: Optional[float] = None,
+                     method: Optional[str] = None, path: Optional[str] = None,
+                     status_code: Optional[int] = None, sort: Optional[str] = None,
+                     order: Optional[str] = None, after_ts: Optional[float] = None,
+                     after_id: Optional[str] = None) -> List[RequestModel]:
         """获取请求记录
         
         Args:
@@ -252,6 +324,13 @@ class DatabaseStorage:
             offset: 偏移量
             start_time: 开始时间戳
             end_time: 结束时间戳
+            method: HTTP方法
+            path: 路径包含的子串
+            status_code: 响应状态码
+            sort: 排序字段，默认按时间倒序
+            order: 排序方向，desc为降序，其他为升序
+            after_ts: 游标时间戳，返回该游标之后（更早）的记录，指定时忽略offset和排序参数
+            after_id: 游标请求ID，与after_ts配合使用
             
         Returns:
             请求记录列表
@@ -263,24 +342,23 @@ class DatabaseStorage:
             cursor = conn.cursor()
             
             # 构建查询语句
-            query = 'SELECT * FROM requests '
-            params = []
-            
-            # 添加时间范围过滤
-            if start_time is not None or end_time is not None:
-                query += 'WHERE '
-                if start_time is not None:
-                    query += 'timestamp >= ? '
-                    params.append(start_time)
-                if start_time is not None and end_time is not None:
-                    query += 'AND '
-                if end_time is not None:
-                    query += 'timestamp <= ? '
-                    params.append(end_time)
+            where, params = self._build_request_filters(start_time, end_time, method, path, status_code)
+            query = 'SELECT * FROM requests ' + where
             
             # 添加排序和分页
-            query += 'ORDER BY timestamp DESC LIMIT ? OFFSET ?'
-            params.extend([limit, offset])
+            if after_ts is not None:
+                # 游标分页：按(timestamp, id)倒序，直接从索引定位到游标位置，避免OFFSET跳过大量记录
+                query += 'AND ' if where else 'WHERE '
+                query += '(timestamp < ? OR (timestamp = ? AND id < ?)) '
+                query += 'ORDER BY timestamp DESC, id DESC LIMIT ?'
+                params.extend([after_ts, after_ts, after_id or '', limit])
+            elif sort in self._REQUEST_SORT_COLUMNS:
+                direction = 'DESC' if order == 'desc' else 'ASC'
+                query += f'ORDER BY {sort} {direction}, timestamp DESC LIMIT ? OFFSET ?'
+                params.extend([limit, offset])
+            else:
+                query += 'ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?'
+                params.extend([limit, offset])
             
             cursor.execute(query, params)
             rows = cursor.fetchall()
@@ -503,6 +581,73 @@ class DatabaseStorage:
         finally:
             self._close_connection(conn)
     
+    # 保存路由的完整SQL语句（包含route_group和响应序列字段）
+    _SAVE_ROUTE_SQL = '''
+                    INSERT OR REPLACE INTO routes 
+                    (id, name, enabled, match_rule, response, validator, route_group, tags, enable_sequence, response_sequences, current_sequence_index, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    '''
+    
+    def _route_to_row(self, route) -> tuple:
+        """将路由转换为数据库行（与_SAVE_ROUTE_SQL的字段顺序一致）
+        
+        Args:
+            route: 路由对象
+            
+        Returns:
+            数据库行参数元组
+        """
+        return (
+            route.id,
+            route.name,
+            1 if route.enabled else 0,
+            json.dumps(route.match_rule.model_dump() if hasattr(route.match_rule, 'model_dump') else route.match_rule),
+            json.dumps(route.response.model_dump() if hasattr(route.response, 'model_dump') else route.response),
+            json.dumps(route.validator.model_dump() if route.validator and hasattr(route.validator, 'model_dump') else route.validator),
+            route.group,
+            json.dumps(route.tags),
+            1 if getattr(route, 'enable_sequence', False) else 0,
+            json.dumps([seq.model_dump() if hasattr(seq, 'model_dump') else seq for seq in (getattr(route, 'response_sequences', []) or [])]),
+            getattr(route, 'current_sequence_index', 0),
+            route.created_at,
+            route.updated_at
+        )
+    
+    def save_routes(self, routes):
+        """批量保存路由（单个事务）
+        
+        Args:
+            routes: 路由对象列表
+        """
+        if not routes:
+            return
+        conn = None
+        try:
+            conn = self._get_connection()
+            with conn:
+                conn.executemany(self._SAVE_ROUTE_SQL, [self._route_to_row(route) for route in routes])
+        finally:
+            self._close_connection(conn)
+    
+    def update_sequence_indexes(self, indexes):
+        """批量更新路由的响应序列索引（单个事务，只修改该字段，不存在的路由不会被写入）
+        
+        Args:
+            indexes: (路由ID, 序列索引) 列表
+        """
+        if not indexes:
+            return
+        conn = None
+        try:
+            conn = self._get_connection()
+            with conn:
+                conn.executemany(
+                    'UPDATE routes SET current_sequence_index = ? WHERE id = ?',
+                    [(index, route_id) for route_id, index in indexes]
+                )
+        finally:
+            self._close_connection(conn)
+    
     def save_route(self, route):
         """保存路由
         
@@ -522,28 +667,7 @@ class DatabaseStorage:
             
             if 'route_group' in columns and has_sequence_fields:
                 # 如果表中包含route_group和响应序列字段，使用包含这些字段的SQL语句
-                cursor.execute(
-                    '''
-                    INSERT OR REPLACE INTO routes 
-                    (id, name, enabled, match_rule, response, validator, route_group, tags, enable_sequence, response_sequences, current_sequence_index, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''',
-                    (
-                        route.id,
-                        route.name,
-                        1 if route.enabled else 0,
-                        json.dumps(route.match_rule.model_dump() if hasattr(route.match_rule, 'model_dump') else route.match_rule),
-                        json.dumps(route.response.model_dump() if hasattr(route.response, 'model_dump') else route.response),
-                        json.dumps(route.validator.model_dump() if route.validator and hasattr(route.validator, 'model_dump') else route.validator),
-                        route.group,
-                        json.dumps(route.tags),
-                        1 if getattr(route, 'enable_sequence', False) else 0,
-                        json.dumps([seq.model_dump() if hasattr(seq, 'model_dump') else seq for seq in (getattr(route, 'response_sequences', []) or [])]),
-                        getattr(route, 'current_sequence_index', 0),
-                        route.created_at,
-                        route.updated_at
-                    )
-                )
+                cursor.execute(self._SAVE_ROUTE_SQL, self._route_to_row(route))
             elif 'route_group' in columns:
                 # 如果表中包含route_group但不包含响应序列字段，使用包含route_group的SQL语句
                 cursor.execute(
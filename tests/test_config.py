@@ -0,0 +1,51 @@
+import pytest
+from app.core import config as config_module
+from app.core.config import ServerConfig, StorageConfig, build_section_config, get_config
+
+
+class TestConfig:
+    """测试配置加载"""
+
+    def test_build_section_config_from_yaml(self):
+        """测试YAML配置中的值经过校验后生效"""
+        server = build_section_config(ServerConfig, {"host": "127.0.0.1", "port": "9090", "unknown": 1})
+        assert server.host == "127.0.0.1"
+        assert server.port == 9090
+
+        storage = build_section_config(StorageConfig, None)
+        assert storage.history_size == 1000
+
+    def test_build_section_config_env_override(self, monkeypatch):
+        """测试环境变量的优先级高于YAML配置"""
+        monkeypatch.setenv("SERVER_PORT", "7070")
+        server = build_section_config(ServerConfig, {"host": "127.0.0.1", "port": 9090})
+        assert server.host == "127.0.0.1"
+        assert server.port == 7070
+
+    def test_load_yaml_config_cache(self, tmp_path):
+        """测试YAML解析结果缓存：配置文件修改后重新解析"""
+        import os
+        from app.core.config import load_yaml_config, YAML_CACHE_SUFFIX
+        config_file = tmp_path / "test.yaml"
+        config_file.write_text("server:\n  port: 9090\n", encoding="utf-8")
+
+        assert load_yaml_config(str(config_file)) == {"server": {"port": 9090}}
+        assert os.path.exists(str(config_file) + YAML_CACHE_SUFFIX)
+        assert load_yaml_config(str(config_file)) == {"server": {"port": 9090}}
+
+        config_file.write_text("server:\n  port: 9091\n  host: localhost\n", encoding="utf-8")
+        assert load_yaml_config(str(config_file)) == {"server": {"port": 9091, "host": "localhost"}}
+
+        # 等长改写并保持修改时间不变，仍按内容识别出变化
+        stat = os.stat(config_file)
+        config_file.write_text("server:\n  port: 9092\n  host: localhost\n", encoding="utf-8")
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert load_yaml_config(str(config_file)) == {"server": {"port": 9092, "host": "localhost"}}
+
+        assert load_yaml_config(str(tmp_path / "missing.yaml")) == {}
+
+    def test_config_singleton(self):
+        """测试全局配置config与get_config()始终为同一实例"""
+        from app.core.config import config
+        assert config is get_config()
+        assert config_module.config is config
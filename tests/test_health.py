@@ -1,3 +1,4 @@
+import os
 import pytest
 from fastapi.testclient import TestClient
 from app.core.server import app
@@ -20,6 +21,21 @@ class TestHealth:
         assert "uptime" in data
         assert "stats" in data
 
+    def test_health_check_etag(self):
+        """测试健康检查的ETag和304响应"""
+        response = self.client.get("/health")
+        etag = response.headers["etag"]
+        response = self.client.get("/health", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+    def test_health_check_html(self):
+        """测试浏览器访问健康检查页面"""
+        response = self.client.get("/health", headers={"Accept": "text/html"})
+        assert response.status_code == 200
+        assert "text/html" in response.headers["content-type"]
+        assert "status_code_distribution" in response.text
+
     def test_metrics(self):
         """测试指标端点"""
         response = self.client.get("/metrics")
@@ -31,6 +47,17 @@ class TestHealth:
         assert "method_distribution" in data
         assert "config" in data
 
+        # 缓存有效期内返回相同的内容
+        assert self.client.get("/metrics").content == response.content
+
+    def test_metrics_prometheus(self):
+        """测试 Prometheus 文本格式的指标"""
+        response = self.client.get("/metrics", headers={"Accept": "text/plain"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE mock_server_uptime_seconds gauge" in response.text
+        assert "mock_server_history_requests " in response.text
+
     def test_info(self):
         """测试信息端点"""
         response = self.client.get("/info")
@@ -41,3 +68,25 @@ class TestHealth:
         assert "description" in data
         assert "features" in data
         assert "endpoints" in data
+
+    def test_root_page(self):
+        """测试首页"""
+        response = self.client.get("/")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+        assert "<h1>Mock Server</h1>" in response.text
+        assert "etag" in response.headers
+
+        cached = self.client.get("/", headers={"If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+    def test_favicon(self):
+        """测试favicon（文件不存在时返回204）"""
+        from app.core import server
+        response = self.client.get("/favicon.ico")
+        if os.path.isfile(server._FAVICON_PATH):
+            assert response.status_code == 200
+        else:
+            assert response.status_code == 204
+            assert response.content == b""
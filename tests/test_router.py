@@ -97,6 +97,45 @@ class TestRouter:
         assert route.name == "更新后的测试路由"
         assert "POST" in route.match_rule.methods
 
+    def test_route_search_text(self):
+        """测试路由搜索文本在更新后刷新"""
+        self.router.add_route(self.route1)
+        assert "/api/users" in self.router.get_search_text(self.route1)
+        updated_route = self.route1.model_copy(update={"group": "Admin"})
+        self.router.update_route(updated_route)
+        assert "admin" in self.router.get_search_text(updated_route)
+
+    def test_routes_snapshot(self):
+        """测试路由快照在变更后失效"""
+        self.router.add_route(self.route1)
+        snapshot = self.router.get_all_routes()
+        assert self.router.get_all_routes() is snapshot
+        self.router.add_route(self.route2)
+        assert len(self.router.get_all_routes()) == 2
+        self.router.clear()
+        assert self.router.get_all_routes() == ()
+
+    def test_routes_by_group_and_tag(self):
+        """测试分组/标签反向索引随路由变更同步"""
+        route1 = self.route1.model_copy(update={"group": "users", "tags": ["a", "b"]})
+        route2 = self.route2.model_copy(update={"group": "users", "tags": ["b"]})
+        self.router.add_route(route1)
+        self.router.add_route(route2)
+        assert {r.id for r in self.router.get_routes_by_group("users")} == {route1.id, route2.id}
+        assert [r.id for r in self.router.get_routes_by_tag("a")] == [route1.id]
+
+        # 原地修改后更新路由，旧的索引项被移除
+        route1.group = "admin"
+        route1.tags = ["c"]
+        self.router.update_route(route1)
+        assert [r.id for r in self.router.get_routes_by_group("users")] == [route2.id]
+        assert [r.id for r in self.router.get_routes_by_group("admin")] == [route1.id]
+        assert self.router.get_routes_by_tag("a") == []
+
+        self.router.remove_route(route2.id)
+        assert self.router.get_routes_by_tag("b") == []
+        assert self.router.get_routes_by_group("users") == []
+
     def test_match_route_exact(self):
         """测试精确路径匹配"""
         self.router.add_route(self.route1)
@@ -282,3 +321,41 @@ class TestRouter:
         )
         assert matched is not None
         assert matched[0].id == "test-route-specific"
+
+    def test_match_route_prefix_tree(self):
+        """测试前缀树匹配：固定段、路径参数、通配符和正则路由按优先级匹配"""
+        def make_route(route_id, path, use_regex=False, methods=("GET",)):
+            return self.route1.model_copy(update={
+                "id": route_id,
+                "match_rule": self.route1.match_rule.model_copy(update={
+                    "path": path, "use_regex": use_regex, "methods": list(methods)
+                })
+            })
+
+        self.router.add_route(self.route1)
+        self.router.add_route(self.route2)
+        self.router.add_route(make_route("route-posts", "/api/users/{id}/posts/{post_id}"))
+        self.router.add_route(make_route("route-wildcard", "/api/files/*"))
+        self.router.add_route(make_route("route-regex", r"^/api/items/(?P<item_id>\d+)$", use_regex=True))
+        self.router.add_route(make_route("route-post", "/api/users/me", methods=("POST",)))
+
+        def match(path, method="GET"):
+            matched = self.router.match_route(method=method, path=path, headers={}, query_params={}, body=None)
+            return (matched[0].id, matched[1]) if matched else None
+
+        assert match("/api/users") == ("test-route-1", {})
+        assert match("/api/users/me") == ("test-route-2", {"id": "me"})
+        assert match("/api/users/me", method="POST") == ("route-post", {})
+        assert match("/api/users/1/posts/2") == ("route-posts", {"id": "1", "post_id": "2"})
+        assert match("/api/files/a/b.txt") == ("route-wildcard", {})
+        assert match("/api/items/42") == ("route-regex", {"item_id": "42"})
+        assert match("/api/items/abc") is None
+        assert match("/api/users/1/posts") is None
+
+        # 禁用路由后不再匹配
+        self.router.update_route(self.route2.model_copy(update={"enabled": False}))
+        assert match("/api/users/me") is None
+
+        # 直接清空路由字典后不再匹配
+        self.router.routes.clear()
+        assert match("/api/users") is None
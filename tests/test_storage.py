@@ -118,3 +118,100 @@ routes:
             # 清理临时文件
             if os.path.exists(temp_config_file):
                 os.unlink(temp_config_file)
+
+    def test_database_request_filters(self):
+        """测试数据库请求记录的过滤查询"""
+        from app.storage.database import DatabaseStorage
+        from app.models.request import Request as RequestModel
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = DatabaseStorage(os.path.join(temp_dir, "test.db"))
+            samples = [
+                ("GET", "/api/users", 200),
+                ("POST", "/api/users", 201),
+                ("GET", "/api/orders", 404),
+            ]
+            for i, (method, path, status) in enumerate(samples):
+                storage.save_request(RequestModel(
+                    id=f"req-{i}",
+                    timestamp=1234567890.0 + i,
+                    method=method,
+                    path=path,
+                    query_params={},
+                    headers={},
+                    body=None,
+                    client_ip="127.0.0.1",
+                    response_status=status,
+                    response_time=0.01
+                ))
+
+            assert len(storage.get_requests(method="GET")) == 2
+            assert [r.id for r in storage.get_requests(path="users")] == ["req-1", "req-0"]
+            assert [r.id for r in storage.get_requests(method="GET", status_code=404)] == ["req-2"]
+            assert storage.get_requests_count(path="users", status_code=201) == 1
+            assert storage.get_requests_count(path="Users") == 0
+            assert [r.id for r in storage.get_requests(sort="response_status", order="desc")] == ["req-2", "req-1", "req-0"]
+            assert [r.id for r in storage.get_requests(sort="method", limit=1)] == ["req-2"]
+
+            # 游标分页
+            first_page = storage.get_requests(limit=2)
+            assert [r.id for r in first_page] == ["req-2", "req-1"]
+            last = first_page[-1]
+            assert [r.id for r in storage.get_requests(limit=2, after_ts=last.timestamp, after_id=last.id)] == ["req-0"]
+
+    def test_database_save_routes(self):
+        """测试数据库批量保存路由"""
+        from app.storage.database import DatabaseStorage
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = DatabaseStorage(os.path.join(temp_dir, "test.db"))
+            second_route = self.test_route.model_copy(update={"id": "test-route-2", "group": "bulk"})
+            storage.save_routes([self.test_route, second_route])
+
+            routes = {route.id: route for route in storage.get_routes()}
+            assert set(routes) == {"test-route", "test-route-2"}
+            assert routes["test-route-2"].group == "bulk"
+
+    def test_database_save_history(self):
+        """测试数据库批量保存请求和响应记录"""
+        from app.storage.database import DatabaseStorage
+        from app.models.request import Request as RequestModel
+        from app.models.response import Response as ResponseModel
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = DatabaseStorage(os.path.join(temp_dir, "test.db"))
+            requests = [
+                RequestModel(id=f"req-{i}", timestamp=1234567890.0 + i, method="GET", path="/api/test",
+                             headers={}, client_ip="127.0.0.1", response_status=200, response_time=0.01)
+                for i in range(3)
+            ]
+            responses = [
+                ResponseModel(id=f"resp-{i}", request_id=f"req-{i}", timestamp=1234567890.0 + i,
+                              status_code=200, headers={}, content={"index": i}, response_time=0.01)
+                for i in range(3)
+            ]
+            storage.save_history(requests, responses)
+            storage.save_history([], [])
+
+            assert storage.get_requests_count() == 3
+            assert storage.get_response_by_request_id("req-1").content == {"index": 1}
+
+    def test_database_request_indexes(self):
+        """测试请求表只保留 (timestamp, id) 复合索引，旧的单列时间戳索引会被删除"""
+        import sqlite3
+        from app.storage.database import DatabaseStorage
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "test.db")
+            DatabaseStorage(db_path)
+            conn = sqlite3.connect(db_path)
+            conn.execute("CREATE INDEX idx_requests_timestamp ON requests (timestamp)")
+            conn.commit()
+            conn.close()
+
+            DatabaseStorage(db_path)
+            conn = sqlite3.connect(db_path)
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            conn.close()
+            assert "idx_requests_timestamp_id" in indexes
+            assert "idx_requests_timestamp" not in indexes